@@ -1,7 +1,11 @@
 class Day1Part1: 
 
 	@staticmethod
-	def count_times_dial_is_at_zero(input_fiename): 
+	def count_times_dial_is_at_zero(input_fiename, processes=None): 
+		if processes:
+			# Landings come out of the same per-chunk summaries Part 2 uses for crossings.
+			from day1_part2 import Day1Part2
+			return Day1Part2.count_zero_hits_parallel(input_fiename, processes)[0]
 		content=''
 		with open(input_fiename, 'r') as f:
 			content = f.read() 
@@ -1,18 +1,24 @@
+import os, re
+from multiprocessing import Pool, cpu_count
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for the vectorized path
+    np = None
+
+DIAL_SIZE = 100
+START_POSITION = 50
+CHUNK_SIZE = 1 << 16 # characters read per block when streaming a file
+
 class Day1Part2:
 
     @staticmethod
-    def count_times_dial_crosses_zero(input_filename):
-        times_dial_crosses_zero = 0
-        content = ''
-        with open(input_filename, 'r') as f:
-            content = f.read()
-
-        lines = content.split()
-        dial_position = 50 # Starting position
-        for line in lines:
-            encountered_zero, dial_position = Day1Part2.rotate_dial(dial_position, line)
-            times_dial_crosses_zero += encountered_zero
-        return times_dial_crosses_zero
+    def count_times_dial_crosses_zero(input_filename, processes=None):
+        if processes:
+            landings, crossings = Day1Part2.count_zero_hits_parallel(input_filename, processes)
+        else:
+            landings, crossings = Day1Part2.count_zero_hits(Day1Part2.parse_rotations(input_filename))
+        return crossings
 
     @staticmethod
     def rotate_dial(starting_position, action):
@@ -20,28 +26,189 @@ class Day1Part2:
             raise ValueError("Starting position must be between 1 and 99")
         direction = action[0]
         amount = int(action[1:])
-        times_dial_crosses_zero=0
         if direction == "R":
-            new_position = starting_position + amount
-            times_dial_crosses_zero, dial_position  = divmod(new_position, 100)
+            times_dial_crosses_zero, dial_position = divmod(starting_position + amount, DIAL_SIZE)
         elif direction == "L":
-            new_position = starting_position - amount
-            dial_position = new_position % 100
-
-            # THIS WORKS
-            import math
-            times_dial_crosses_zero = math.trunc(abs(new_position / 100))
-            if (starting_position > 0 and new_position <= 0): times_dial_crosses_zero += 1
-
-            # THE ABOVE WORKS BUT WHY CAN'T I USE DIVMOD HERE?
-            # times_dial_crosses_zero, dial_position  = divmod(new_position, 100)
-            # times_dial_crosses_zero = abs(times_dial_crosses_zero)
-            # if (starting_position > 0 and new_position <= 0): times_dial_crosses_zero += 1
-
+            # Turning left is the same as turning right on a mirrored dial, where
+            # position p becomes (100 - p) % 100. That lets us use floor division
+            # instead of truncating a float.
+            times_dial_crosses_zero = ((DIAL_SIZE - starting_position) % DIAL_SIZE + amount) // DIAL_SIZE
+            dial_position = (starting_position - amount) % DIAL_SIZE
         else:
             raise ValueError("Invalid direction; expected 'L' or 'R'")
         return times_dial_crosses_zero, dial_position
 
+    @staticmethod
+    def parse_rotations(source, chunk_size=CHUNK_SIZE):
+        # Yields signed deltas (R is positive, L is negative) from a filename, an open
+        # file, or an iterable of strings such as lines or tokens. Files are read in
+        # blocks so the whole input never has to be in memory at once.
+        if isinstance(source, str):
+            with open(source, 'r') as f:
+                yield from Day1Part2.parse_rotations(f, chunk_size)
+            return
+        if hasattr(source, 'read'):
+            blocks = iter(lambda: source.read(chunk_size), '')
+        else:
+            blocks = (item + ' ' for item in source) # each item ends on a token boundary
+        yield from Day1Part2.parse_rotation_blocks(blocks)
+
+    @staticmethod
+    def parse_rotation_blocks(blocks):
+        partial = ''
+        for block in blocks:
+            tokens = (partial + block).split()
+            # A block that doesn't end in whitespace may have cut the last token in half.
+            partial = tokens.pop() if tokens and not block[-1].isspace() else ''
+            for token in tokens:
+                yield Day1Part2.parse_rotation(token)
+        if partial:
+            yield Day1Part2.parse_rotation(partial)
+
+    @staticmethod
+    def parse_rotation(token):
+        direction = token[0]
+        if direction == "R":
+            return int(token[1:])
+        elif direction == "L":
+            return -int(token[1:])
+        raise ValueError("Invalid direction; expected 'L' or 'R'")
+
+    @staticmethod
+    def count_zero_hits(deltas, start=START_POSITION):
+        # Returns (landings, crossings): how many rotations end on 0 (Part 1) and how
+        # many times the dial points at 0 during any rotation (Part 2).
+        landings, crossings = 0, 0
+        position = start
+        for delta in deltas:
+            if delta >= 0:
+                crossings += (position + delta) // DIAL_SIZE
+            else:
+                crossings += ((DIAL_SIZE - position) % DIAL_SIZE - delta) // DIAL_SIZE
+            position = (position + delta) % DIAL_SIZE
+            if position == 0:
+                landings += 1
+        return landings, crossings
+
+    @staticmethod
+    def count_zero_hits_vectorized(deltas, start=START_POSITION):
+        # Same result as count_zero_hits, for a whole array of deltas at once. The
+        # dial position is tracked without wrapping (a running sum), so the number
+        # of zeros passed on a step is how many multiples of 100 lie between the
+        # previous and the new position.
+        if np is None:
+            raise ImportError("numpy is required for count_zero_hits_vectorized")
+        deltas = np.asarray(deltas, dtype=np.int64)
+        if deltas.size == 0:
+            return 0, 0
+        positions = np.cumsum(deltas) + start
+        previous = np.empty_like(positions)
+        previous[0] = start
+        previous[1:] = positions[:-1]
+        right = deltas >= 0
+        # Moving right from a to b passes multiples of 100 in (a, b]; moving left,
+        # the multiples in [b, a).
+        crossed = np.where(right,
+                           positions // DIAL_SIZE - previous // DIAL_SIZE,
+                           (previous - 1) // DIAL_SIZE - (positions - 1) // DIAL_SIZE)
+        landings = int(np.count_nonzero(positions % DIAL_SIZE == 0))
+        return landings, int(crossed.sum())
+
+    @staticmethod
+    def summarize_rotations(deltas):
+        # Summarizes a run of rotations without knowing where the dial starts, as
+        # (net offset, landings, crossings) where landings[s] and crossings[s] are
+        # the counts for a run that starts at position s. Positions are tracked
+        # relative to the start and without wrapping. For a start s, a position x
+        # sits at x + s, and floor((x + s) / 100) is floor(x / 100) plus 1 when
+        # x % 100 + s >= 100. So every count splits into a part that doesn't
+        # depend on s plus a histogram of remainders, and the per-start totals
+        # come out of suffix sums over that histogram.
+        landing_hist = [0] * DIAL_SIZE
+        carry_hist = [0] * DIAL_SIZE # +1 for a remainder on the far end of a step, -1 on the near end
+        base_crossings = 0
+        position = 0
+        for delta in deltas:
+            previous = position
+            position += delta
+            if delta >= 0:
+                high, low = position, previous # passes multiples of 100 in (previous, position]
+            else:
+                high, low = previous - 1, position - 1 # passes multiples of 100 in [position, previous)
+            base_crossings += high // DIAL_SIZE - low // DIAL_SIZE
+            carry_hist[high % DIAL_SIZE] += 1
+            carry_hist[low % DIAL_SIZE] -= 1
+            landing_hist[position % DIAL_SIZE] += 1
+
+        landings = [landing_hist[-s % DIAL_SIZE] for s in range(DIAL_SIZE)]
+        crossings = [base_crossings] * DIAL_SIZE
+        carries = 0
+        for s in range(1, DIAL_SIZE):
+            carries += carry_hist[DIAL_SIZE - s] # remainders r with r + s >= 100
+            crossings[s] += carries
+        return position % DIAL_SIZE, landings, crossings
+
+    @staticmethod
+    def combine_summaries(summaries, start=START_POSITION):
+        # Stitches chunk summaries from summarize_rotations back together in order.
+        landings, crossings = 0, 0
+        position = start
+        for offset, chunk_landings, chunk_crossings in summaries:
+            landings += chunk_landings[position]
+            crossings += chunk_crossings[position]
+            position = (position + offset) % DIAL_SIZE
+        return landings, crossings
+
+    @staticmethod
+    def chunk_boundaries(input_filename, chunks):
+        # Splits the file into roughly equal byte ranges, moving each split forward
+        # to the next whitespace so no rotation token is cut in half.
+        size = os.path.getsize(input_filename)
+        boundaries = [0]
+        with open(input_filename, 'rb') as f:
+            for k in range(1, chunks):
+                offset = max(size * k // chunks, boundaries[-1])
+                f.seek(offset)
+                while offset < size:
+                    block = f.read(64)
+                    match = re.search(rb'\s', block)
+                    if match:
+                        offset += match.start()
+                        break
+                    offset += len(block)
+                boundaries.append(min(offset, size))
+        boundaries.append(size)
+        return [(start, end) for start, end in zip(boundaries, boundaries[1:]) if start < end]
+
+    @staticmethod
+    def summarize_file_chunk(job):
+        input_filename, start, end = job
+        with open(input_filename, 'rb') as f:
+            f.seek(start)
+            def blocks():
+                remaining = end - start
+                while remaining > 0:
+                    block = f.read(min(CHUNK_SIZE, remaining))
+                    if not block:
+                        break
+                    remaining -= len(block)
+                    yield block.decode('ascii')
+            return Day1Part2.summarize_rotations(Day1Part2.parse_rotation_blocks(blocks()))
+
+    @staticmethod
+    def count_zero_hits_parallel(input_filename, processes=None, start=START_POSITION):
+        # Same result as count_zero_hits over the whole file, but each byte range is
+        # summarized on its own core and the summaries are combined afterwards.
+        processes = processes or cpu_count()
+        jobs = [(input_filename, chunk_start, chunk_end)
+                for chunk_start, chunk_end in Day1Part2.chunk_boundaries(input_filename, processes * 4)]
+        if processes == 1:
+            summaries = map(Day1Part2.summarize_file_chunk, jobs)
+            return Day1Part2.combine_summaries(summaries, start)
+        with Pool(processes) as pool:
+            summaries = pool.imap(Day1Part2.summarize_file_chunk, jobs)
+            return Day1Part2.combine_summaries(summaries, start)
+
 if __name__ == "__main__":
     import sys
     if len(sys.argv) != 2:
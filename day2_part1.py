@@ -13,30 +13,58 @@ class Day2Part1:
             input_ranges.append((start, end))
         return input_ranges
     
+    # An ID made of one block of `block_length` digits repeated to fill `length`
+    # digits is block * repunit, where repunit = (10^length - 1) / (10^block_length - 1)
+    # (for example 123123 = 123 * 1001). So instead of scanning every number in a
+    # range, we can work out which blocks land inside it.
+
+    @staticmethod
+    def digit_lengths(start, end):
+        return range(len(str(start)), len(str(end)) + 1)
+
+    @staticmethod
+    def block_range(start, end, length, block_length):
+        # Returns (first_block, last_block, repunit) for the repeated-block IDs with
+        # `length` digits in [start, end]. The block range is empty when first > last.
+        repunit = (10**length - 1) // (10**block_length - 1)
+        first = max(10**(block_length - 1), -(-start // repunit)) # ceil(start / repunit)
+        last = min(10**block_length - 1, end // repunit)
+        return first, last, repunit
+
+    @staticmethod
+    def repeated_block_ids(start, end, length, block_length):
+        first, last, repunit = Day2Part1.block_range(start, end, length, block_length)
+        return [block * repunit for block in range(first, last + 1)]
+
+    @staticmethod
+    def repeated_block_sum(start, end, length, block_length):
+        first, last, repunit = Day2Part1.block_range(start, end, length, block_length)
+        if first > last:
+            return 0
+        return repunit * (first + last) * (last - first + 1) // 2
+
     @staticmethod
     def invalid_ids(start, end):
         invalid_ids = []
-        for n in range(start, end + 1):
-            sn = str(n)
-            # print("sn: ", sn)
-            length = len(sn)
-            # print("length: ", length)
-            halfway = int(length/2)
-            # print("sn[0:halfway]: ", sn[0:halfway])
-            # print("sn[halfway:length]: ", sn[halfway:length])
-            if sn[0:halfway] == sn[halfway:length]:
-                # print("Invalid ID:", n)
-                invalid_ids.append(n)
-        # print("invalid_ids: ", invalid_ids)
+        for length in Day2Part1.digit_lengths(start, end):
+            if length % 2 == 0:
+                invalid_ids.extend(Day2Part1.repeated_block_ids(start, end, length, length // 2))
         return invalid_ids
 
+    @staticmethod
+    def sum_of_range(start, end):
+        total = 0
+        for length in Day2Part1.digit_lengths(start, end):
+            if length % 2 == 0:
+                total += Day2Part1.repeated_block_sum(start, end, length, length // 2)
+        return total
+
     @staticmethod
     def sum_of_invalid_ids(input_filename):
         input_ranges = Day2Part1.parse_input(input_filename)
         total = 0
         for i, j in input_ranges:
-            invalid_ids = Day2Part1.invalid_ids(i, j)
-            total += sum(invalid_ids)
+            total += Day2Part1.sum_of_range(i, j)
         return total
 
 if __name__ == "__main__":
@@ -1,7 +1,18 @@
 import sys
 import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+from itertools import combinations
+from math import prod
+from day2_part1 import Day2Part1 # reuse the repeated-block arithmetic from part 1
+
+try:
+    import numpy as np
+except ImportError: # numpy is only needed to classify arrays of IDs
+    np = None
 
 DEBUG = False
+SCAN_BLOCK = 1 << 20 # IDs checked per block when brute-force scanning a shard
 
 class Day2Part2:
 
@@ -17,57 +28,151 @@ class Day2Part2:
             input_ranges.append((start, end))
         return input_ranges
     
+    # Digit length -> [(10^L, repunit)] for every proper divisor L of that length,
+    # filled in the first time a length is seen.
+    period_tables = {}
+
+    @staticmethod
+    def period_table(length):
+        table = Day2Part2.period_tables.get(length)
+        if table is None:
+            table = [(10**block_length, (10**length - 1) // (10**block_length - 1))
+                     for block_length in range(1, length // 2 + 1) if length % block_length == 0]
+            Day2Part2.period_tables[length] = table
+        return table
+
     @staticmethod
     def invalid_id(n):
-        sn = str(n) # 565656
-        print("sn: ", sn) if DEBUG else None
-        length = len(sn) # 6
-        if length == 1:
-            return False
-        seq = ''
-        for j in range(1, length//2 + 1): # j = 1,2,3
-            dup = True
-            for i in range(length): # i = 0,1,2,3,4,5
-                seq = sn[i:i+j] 
-                print(f"i: {i}, j: {j}, seq: {seq}, sn[{j}:{j+len(seq)}]: {sn[j:j+len(seq)]}") if DEBUG else None
-                for k in range(10):
-                    start = j+k*len(seq)
-                    end = start + len(seq)
-                    if start >= length:
-                        break
-                    print(f"i: {i}, j: {j}, k: {k}, start: {start}, end: {end}, seq: {seq}, sn[{start}:{end}]: {sn[start:end]}") if DEBUG else None
-                    if seq == sn[start:end]:
-                        dup = dup and True
-                        print(f"dup: {dup}") if DEBUG else None
-                    else:
-                        dup = False
-                        print(f"dup: {dup}, breaking k loop") if DEBUG else None
-                        break
-                if dup == True:
-                    return True
-                else:
-                    print("breaking i loop") if DEBUG else None
-                    break
-        return dup
+        # n repeats with an L-digit block exactly when it equals its last L digits
+        # times the repunit for L, e.g. 565656 == 56 * 10101.
+        for modulus, repunit in Day2Part2.period_table(len(str(n))):
+            if n == n % modulus * repunit:
+                print(f"{n} repeats {n % modulus}") if DEBUG else None
+                return True
+        return False
+
+    @staticmethod
+    def classify_ids(ids):
+        # Batch version of invalid_id. A numpy array is checked one digit length at
+        # a time with whole-array operations for IDs up to 18 digits; 19-digit IDs
+        # would overflow int64 in the repunit products, so those go through
+        # invalid_id one at a time. Anything else is checked one ID at a time.
+        if np is not None and isinstance(ids, np.ndarray):
+            ids = ids.astype(np.int64, copy=False)
+            result = np.zeros(ids.shape, dtype=bool)
+            for index in np.flatnonzero(ids.ravel() >= 10**18):
+                result.flat[index] = Day2Part2.invalid_id(int(ids.flat[index]))
+            for length in range(2, 19):
+                in_length = (ids >= 10**(length - 1)) & (ids < 10**length)
+                if not in_length.any():
+                    continue
+                group = ids[in_length]
+                repeats = np.zeros(group.shape, dtype=bool)
+                for modulus, repunit in Day2Part2.period_table(length):
+                    repeats |= group == group % modulus * repunit
+                result[in_length] = repeats
+            return result
+        return [Day2Part2.invalid_id(n) for n in ids]
+
+    @staticmethod
+    def scan_invalid_ids(start, end):
+        # Checks every ID in the range. Much slower than invalid_ids, but it doesn't
+        # rely on the block arithmetic, so it's useful for cross-checking.
+        start, end = int(start), int(end)
+        if np is not None and end < 10**18:
+            ids = np.arange(start, end + 1, dtype=np.int64)
+            return ids[Day2Part2.classify_ids(ids)].tolist()
+        return [n for n in range(start, end + 1) if Day2Part2.invalid_id(n)]
+
+    @staticmethod
+    def prime_factors(n):
+        factors = []
+        p = 2
+        while p * p <= n:
+            if n % p == 0:
+                factors.append(p)
+                while n % p == 0:
+                    n //= p
+            p += 1
+        if n > 1:
+            factors.append(n)
+        return factors
 
     @staticmethod
     def invalid_ids(start, end):
+        start, end = int(start), int(end)
         invalid_ids = []
-        for n in range(int(start), int(end) + 1):
-            if Day2Part2.invalid_id(n):
-                invalid_ids.append(n)
+        for length in Day2Part1.digit_lengths(start, end):
+            # 222222 repeats with blocks of 1, 2 and 3 digits, so use a set to count it once.
+            ids = set()
+            for block_length in range(1, length // 2 + 1):
+                if length % block_length == 0:
+                    ids.update(Day2Part1.repeated_block_ids(start, end, length, block_length))
+            invalid_ids.extend(sorted(ids))
         return invalid_ids
 
+    @staticmethod
+    def sum_of_range(start, end):
+        start, end = int(start), int(end)
+        total = 0
+        for length in Day2Part1.digit_lengths(start, end):
+            # Every repeating ID repeats with a block of length/p digits for some prime
+            # p dividing the length (a 2-digit block repeated 6 times is also a 4-digit
+            # block repeated 3 times). IDs that repeat with blocks of length/p and
+            # length/q are exactly the ones that repeat with length/(p*q), so
+            # inclusion-exclusion over the primes counts each ID once.
+            primes = Day2Part2.prime_factors(length)
+            for r in range(1, len(primes) + 1):
+                sign = 1 if r % 2 == 1 else -1
+                for chosen in combinations(primes, r):
+                    total += sign * Day2Part1.repeated_block_sum(start, end, length, length // prod(chosen))
+        return total
+
     @staticmethod
     def sum_of_invalid_ids(input_filename):
         input_ranges = Day2Part2.parse_input(input_filename)
         total = 0
         for i, j in input_ranges:
-            invalid_ids = Day2Part2.invalid_ids(i, j)
-            # print(f"invalid_ids for range {i}-{j}: {invalid_ids}")
-            total += sum(invalid_ids)
+            total += Day2Part2.sum_of_range(i, j)
         return total
 
+    @staticmethod
+    def shard_ranges(input_ranges, shards):
+        # Splits the ranges into sub-ranges of at most ceil(total IDs / shards) IDs
+        # each, so a single huge range doesn't end up on one core.
+        input_ranges = [(int(start), int(end)) for start, end in input_ranges]
+        total = sum(end - start + 1 for start, end in input_ranges)
+        shard_size = max(1, -(-total // shards))
+        result = []
+        for start, end in input_ranges:
+            while start <= end:
+                shard_end = min(end, start + shard_size - 1)
+                result.append((start, shard_end))
+                start = shard_end + 1
+        return result
+
+    @staticmethod
+    def sum_of_shard(shard):
+        # Returns (start, end, sum of invalid IDs, seconds taken) for one shard.
+        start, end = shard
+        began = time.perf_counter()
+        total = 0
+        for block_start in range(start, end + 1, SCAN_BLOCK):
+            block_end = min(end, block_start + SCAN_BLOCK - 1)
+            total += sum(Day2Part2.scan_invalid_ids(block_start, block_end))
+        return start, end, total, time.perf_counter() - began
+
+    @staticmethod
+    def parallel_sum_of_invalid_ids(input_filename, workers=None, shards_per_worker=4):
+        # Brute-force sum of the invalid IDs, fanned out over a process pool.
+        # Returns the total and the per-shard results from sum_of_shard.
+        workers = workers or os.cpu_count()
+        shards = Day2Part2.shard_ranges(Day2Part2.parse_input(input_filename), workers * shards_per_worker)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = list(executor.map(Day2Part2.sum_of_shard, shards))
+        total = sum(partial for _, _, partial, _ in results)
+        return total, results
+
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
     if len(sys.argv) == 2:
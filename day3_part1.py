@@ -1,4 +1,11 @@
-import sys, os
+import sys, os, mmap
+
+try:
+    import numpy as np
+except ImportError: # without numpy, banks are handled one line at a time
+    np = None
+
+BLOCK_CELLS = 1 << 22 # digits per block of banks in the vectorized path
 
 class Day3Part1:
 
@@ -8,23 +15,78 @@ class Day3Part1:
         return lines
     
     @staticmethod
-    def max_joltage(line):
-        line = line.strip()
-        first_digit, second_digit = '0', '0'
-        for n, digit in enumerate(line):
-            if int(digit) > int(first_digit) and n < len(line) - 1:
-                first_digit = digit
-                second_digit = '0'
-            elif int(first_digit + digit) > int(first_digit + second_digit):
-                second_digit = digit
-        return int(first_digit + second_digit)
+    def select_batteries(digits, k):
+        # Largest k-digit subsequence of digits, in one pass. Keep a stack of the
+        # digits chosen so far; a bigger digit knocks smaller ones off the top as
+        # long as enough digits are left to still make k in total.
+        can_drop = len(digits) - k
+        stack = []
+        for digit in digits:
+            while can_drop > 0 and stack and stack[-1] < digit:
+                stack.pop()
+                can_drop -= 1
+            stack.append(digit)
+        return stack[:k]
+
+    @staticmethod
+    def max_joltage(line, k=2):
+        return int(''.join(Day3Part1.select_batteries(line.strip(), k)) or '0')
+
+    @staticmethod
+    def total_output_joltage(input_filename, k=2):
+        # Reads the file as bytes through mmap. If every bank is the same length, the
+        # banks are stacked into a digit matrix and solved in blocks with numpy;
+        # otherwise each line is solved on its own, still as bytes.
+        with open(input_filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return 0
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                total = Day3Part1.total_joltage_vectorized(data, k) if np is not None else None
+                if total is None:
+                    total = sum(Day3Part1.bytes_joltage(line, k) for line in iter(data.readline, b''))
+        return total
+
+    @staticmethod
+    def bytes_joltage(line, k):
+        return int(bytes(Day3Part1.select_batteries(line.strip(), k)) or b'0')
+
+    @staticmethod
+    def total_joltage_vectorized(data, k):
+        # Returns None when the banks can't be laid out as a matrix (uneven lengths,
+        # stray characters or banks shorter than k).
+        raw = np.frombuffer(data, dtype=np.uint8)
+        ends = np.flatnonzero(raw == ord('\n'))
+        if ends.size == 0 or ends[-1] != raw.size - 1:
+            ends = np.append(ends, raw.size)
+        starts = np.concatenate(([0], ends[:-1] + 1))
+        ends = ends - (raw[np.maximum(ends - 1, 0)] == ord('\r')) # allow \r\n line endings
+        not_blank = ends > starts
+        starts, widths = starts[not_blank], (ends - starts)[not_blank]
+        if starts.size == 0 or (widths != widths[0]).any() or widths[0] < k:
+            return None
+        width = int(widths[0])
+        block_rows = max(1, BLOCK_CELLS // width)
+        total = 0
+        for first in range(0, starts.size, block_rows):
+            block = raw[starts[first:first + block_rows, None] + np.arange(width)]
+            if block.min() < ord('0') or block.max() > ord('9'):
+                return None
+            total += Day3Part1.matrix_joltage(block.astype(np.int16) - ord('0'), k)
+        return total
 
     @staticmethod
-    def total_output_joltage(input_filename):
-        lines = Day3Part1.parse_input(input_filename)
+    def matrix_joltage(banks, k):
+        # Greedy selection for every row of a digit matrix at once: the i-th chosen
+        # battery is the leftmost largest digit after the previous choice that still
+        # leaves k - i - 1 digits to its right.
+        rows, width = banks.shape
+        columns = np.arange(width)
+        chosen = np.full(rows, -1)
         total = 0
-        for line in lines:
-            total += Day3Part1.max_joltage(line)
+        for i in range(k):
+            window = (columns > chosen[:, None]) & (columns <= width - k + i)
+            chosen = np.where(window, banks, -1).argmax(axis=1)
+            total += int(banks[np.arange(rows), chosen].sum(dtype=np.int64)) * 10**(k - 1 - i)
         return total
     
 if __name__ == "__main__":
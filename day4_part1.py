@@ -1,5 +1,13 @@
 import sys, os
 
+try:
+    import numpy as np
+except ImportError: # numpy only speeds up packing the grid into bits
+    np = None
+
+# bytes.translate table that turns '@' into '1' and everything else into '0'
+ROLL_BITS = bytes(ord('1') if b == ord('@') else ord('0') for b in range(256))
+
 class Day4Part1:
     DEBUG = False
 
@@ -34,18 +42,65 @@ class Day4Part1:
             print("adj_count = " + str(adj_count) + " at (" + str(x) + ", " + str(y) + ")") if Day4Part1.DEBUG else None
             return adj_count < 4
     
+    @staticmethod
+    def grid_bitset(lines):
+        # Packs the whole grid into one int: the roll at (x, y) is bit y * stride + x.
+        # Each row gets a spare empty column at the end, so shifting by one column
+        # never wraps a roll into the neighbouring row.
+        width = max((len(line) for line in lines), default=0)
+        stride = width + 1
+        if all(len(line) == width for line in lines):
+            packed = '.'.join(lines).encode() # the separator is the spare column
+        else:
+            packed = b''.join(line.encode().ljust(stride, b'.') for line in lines)
+        if np is not None:
+            bits = np.packbits(np.frombuffer(packed, dtype=np.uint8) == ord('@'), bitorder='little')
+            grid = int.from_bytes(bits.tobytes(), 'little')
+        else:
+            grid = int(packed.translate(ROLL_BITS)[::-1] or b'0', 2)
+        return grid, stride
+
+    @staticmethod
+    def accessible_bitset(grid, stride):
+        # Adds up the eight shifted copies of the grid bit by bit, so every cell's
+        # neighbour count is worked out at once. Only "4 or more" matters, so the
+        # counter keeps a ones bit, a twos bit and a sticky fours bit per cell.
+        neighbours = (
+            grid << (stride + 1), grid << stride, grid << (stride - 1),
+            grid << 1, grid >> 1,
+            grid >> (stride - 1), grid >> stride, grid >> (stride + 1)
+        )
+        ones, twos, fours = 0, 0, 0
+        for neighbour in neighbours:
+            carry = ones & neighbour
+            ones ^= neighbour
+            fours |= twos & carry
+            twos ^= carry
+        return grid & ~fours
+
+    @staticmethod
+    def bit_positions(bits, stride):
+        positions = []
+        digits = bin(bits)[:1:-1] # lowest bit first
+        n = digits.find('1')
+        while n >= 0:
+            positions.append((n % stride, n // stride))
+            n = digits.find('1', n + 1)
+        return positions
+
     @staticmethod
     def accessible_rolls(lines):    
-        accessible_rolls = []
-        for y in range(len(lines)):
-            for x in range(len(lines[y])):
-                if Day4Part1.roll_is_accessible(x, y, lines):
-                    accessible_rolls.append((x, y))
-        return accessible_rolls
+        grid, stride = Day4Part1.grid_bitset(lines)
+        return Day4Part1.bit_positions(Day4Part1.accessible_bitset(grid, stride), stride)
 
     @staticmethod
     def count_of_accessible_rolls(lines):
-        return len(Day4Part1.accessible_rolls(lines))
+        grid, stride = Day4Part1.grid_bitset(lines)
+        return Day4Part1.count_bits(Day4Part1.accessible_bitset(grid, stride))
+
+    @staticmethod
+    def count_bits(bits):
+        return bits.bit_count() if hasattr(bits, 'bit_count') else bin(bits).count('1') # int.bit_count is Python 3.10+
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
@@ -7,21 +7,54 @@ class Day4Part2:
     @staticmethod
     def total_rolls_removed(input_filename):
         lines = Day4Part1.parse_input(input_filename)
-        total_rolls_removed = 0
-        while True:
-            accessible_rolls = Day4Part1.accessible_rolls(lines)
-            print() if Day4Part2.DEBUG else None
-            print(f"Accessible rolls: {accessible_rolls}") if Day4Part2.DEBUG else None
-            if len(accessible_rolls) == 0:
-                break
-            for roll in accessible_rolls:
-                line = lines[roll[1]]
-                lines[roll[1]] = line[:roll[0]] + "x" + line[roll[0]+1:] # replace the @ with an x
-                total_rolls_removed += 1
-                print(f"Total rolls removed: {total_rolls_removed}") if Day4Part2.DEBUG else None
-                print(lines) if Day4Part2.DEBUG else None
+        removal_order, rolls_per_round = Day4Part2.peel_rolls(lines)
+        print(f"Rolls removed per round: {rolls_per_round}") if Day4Part2.DEBUG else None
+        return len(removal_order)
 
-        return total_rolls_removed
+    @staticmethod
+    def peel_rolls(lines):
+        # Removes accessible rolls round by round, like the puzzle describes, but
+        # without rescanning the grid. Neighbour counts are worked out once; removing
+        # a roll only decrements its neighbours, and a neighbour whose count drops
+        # to 3 becomes accessible in the next round. Each roll is removed at most
+        # once, so the total work is proportional to the number of cells.
+        # Returns the removed rolls as (x, y) in order, and how many went per round.
+        width = max((len(line) for line in lines), default=0)
+        stride = width + 2 # a border of empty cells all the way round saves bounds checks
+        is_roll = bytearray(stride * (len(lines) + 2))
+        for y, line in enumerate(lines):
+            row_start = (y + 1) * stride + 1
+            x = line.find('@')
+            while x >= 0:
+                is_roll[row_start + x] = 1
+                x = line.find('@', x + 1)
+
+        neighbour_offsets = (-stride - 1, -stride, -stride + 1, -1, 1, stride - 1, stride, stride + 1)
+        counts = bytearray(len(is_roll))
+        accessible = []
+        for cell, roll in enumerate(is_roll):
+            if roll:
+                counts[cell] = sum(is_roll[cell + offset] for offset in neighbour_offsets)
+                if counts[cell] < 4:
+                    accessible.append(cell)
+
+        removal_order, rolls_per_round = [], []
+        while accessible:
+            rolls_per_round.append(len(accessible))
+            for cell in accessible:
+                is_roll[cell] = 0
+            next_accessible = []
+            for cell in accessible:
+                removal_order.append((cell % stride - 1, cell // stride - 1))
+                for offset in neighbour_offsets:
+                    neighbour = cell + offset
+                    if is_roll[neighbour]:
+                        counts[neighbour] -= 1
+                        if counts[neighbour] == 3:
+                            next_accessible.append(neighbour)
+            next_accessible.sort() # keep each round in reading order
+            accessible = next_accessible
+        return removal_order, rolls_per_round
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
@@ -1,4 +1,5 @@
 import sys, os
+from array import array
 
 class Day5Part1:
     DEBUG = False
@@ -21,15 +22,42 @@ class Day5Part1:
                 print(ids) if Day5Part1.DEBUG else None
         return ranges, ids
 
+    @staticmethod
+    def read_ranges(f):
+        # Reads the range lines from an open file, up to the blank line, into
+        # compact arrays of starts and ends. The file is left at the first ID.
+        starts, ends = array('q'), array('q')
+        for line in f:
+            line = line.strip()
+            if line == '':
+                break
+            start, end = line.split('-')
+            starts.append(int(start))
+            ends.append(int(end))
+        return starts, ends
+
+    @staticmethod
+    def read_ids(f):
+        for line in f:
+            line = line.strip()
+            if line:
+                yield int(line)
+
+    @staticmethod
+    def fresh_ingredient_count_from_file(input_filename):
+        # Streams the file: the ranges go into an index, then each ID is checked as
+        # it's read, so the IDs never have to be held in memory.
+        from day5_part2 import Day5Part2 # imported here because day5_part2 imports this module
+        with open(input_filename) as f:
+            starts, ends = Day5Part1.read_ranges(f)
+            index = Day5Part2.build_index(zip(starts, ends))
+            return Day5Part2.count_fresh(index, Day5Part1.read_ids(f))
+
     @staticmethod
     def fresh_ingredient_count(ranges, ids):
-        count = 0
-        for id in ids:
-            for range in ranges:
-                if range[0] <= id <= range[1]:
-                    count += 1
-                    break
-        return count
+        from day5_part2 import Day5Part2 # imported here because day5_part2 imports this module
+        index = Day5Part2.build_index(ranges)
+        return Day5Part2.count_fresh(index, ids)
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
@@ -45,8 +73,6 @@ if __name__ == "__main__":
             print(f"Usage: python {sys.argv[0]} <input_filename>")
             sys.exit(1)
   
-    input_text = open(input_filename).read()
-    ranges, ids = Day5Part1.parse_input(input_text)     
-    result = Day5Part1.fresh_ingredient_count(ranges, ids)
+    result = Day5Part1.fresh_ingredient_count_from_file(input_filename)
     print(f"Day 5 Part 1 result: {result}")
 
@@ -1,8 +1,17 @@
-import sys, os
+import sys, os, heapq, tempfile
+from array import array
+from bisect import bisect_left, bisect_right
 from day5_part1 import Day5Part1
 
+try:
+    import numpy as np
+except ImportError: # numpy is only needed for count_fresh_vectorized
+    np = None
+
 class Day5Part2:
     DEBUG = False
+    RUN_SIZE = 1 << 20 # ranges sorted in memory at a time by merge_ranges_external
+    READ_BLOCK = 1 << 16 # ranges read back from a spilled run at a time
 
     @staticmethod
     def merge_ranges(ranges):
@@ -30,14 +39,173 @@ class Day5Part2:
         return [tuple(r) for r in merged]
 
     @staticmethod
-    def fresh_ingredient_id_count(ranges, ids):
-        merged_ranges = Day5Part2.merge_ranges(ranges)
+    def merge_ranges_external(ranges, run_size=RUN_SIZE):
+        """
+        Same result as merge_ranges, but for more ranges than fit in memory. Ranges
+        are read from any iterable in runs of run_size, and each run is sorted and
+        spilled to a temporary file. The runs are then k-way merged with
+        heapq.merge and overlaps are coalesced as they stream past. Merged ranges
+        are yielded one at a time.
+        """
+        runs = []
+        try:
+            run = []
+            for start, end in ranges:
+                run.append((start, end))
+                if len(run) == run_size:
+                    runs.append(Day5Part2.spill_run(run))
+                    run = []
+            if runs:
+                if run:
+                    runs.append(Day5Part2.spill_run(run))
+                sorted_ranges = heapq.merge(*(Day5Part2.read_run(f) for f in runs))
+            else:
+                sorted_ranges = sorted(run) # everything fit in one run, no need to spill it
+
+            merged_start, merged_end = None, None
+            for start, end in sorted_ranges:
+                if merged_start is None:
+                    merged_start, merged_end = start, end
+                elif start > merged_end:
+                    yield merged_start, merged_end
+                    merged_start, merged_end = start, end
+                else:
+                    merged_end = max(merged_end, end)
+            if merged_start is not None:
+                yield merged_start, merged_end
+        finally:
+            for f in runs:
+                f.close()
+
+    @staticmethod
+    def spill_run(run):
+        run.sort()
+        buffer = array('q')
+        for start, end in run:
+            buffer.append(start)
+            buffer.append(end)
+        f = tempfile.TemporaryFile()
+        buffer.tofile(f)
+        f.seek(0)
+        return f
+
+    @staticmethod
+    def read_run(f):
+        while True:
+            buffer = array('q')
+            try:
+                buffer.fromfile(f, 2 * Day5Part2.READ_BLOCK)
+            except EOFError:
+                pass # the last block is short; fromfile still keeps what it read
+            if not buffer:
+                return
+            for i in range(0, len(buffer), 2):
+                yield buffer[i], buffer[i + 1]
+
+    @staticmethod
+    def build_index(ranges):
+        # Merged ranges as two parallel sorted arrays of starts and ends, so an ID
+        # can be looked up with a binary search on the starts.
+        starts, ends = array('q'), array('q')
+        for start, end in Day5Part2.merge_ranges(ranges):
+            starts.append(start)
+            ends.append(end)
+        return starts, ends
+
+    @staticmethod
+    def is_fresh(index, id):
+        starts, ends = index
+        i = bisect_right(starts, id) - 1 # last range starting at or before id
+        return i >= 0 and id <= ends[i]
+
+    @staticmethod
+    def count_fresh(index, ids):
+        if np is not None and isinstance(ids, np.ndarray):
+            return Day5Part2.count_fresh_vectorized(index, ids)
+        return sum(1 for id in ids if Day5Part2.is_fresh(index, id))
+
+    @staticmethod
+    def count_fresh_vectorized(index, ids):
+        starts, ends = (np.frombuffer(a, dtype=np.int64) for a in index)
+        if starts.size == 0:
+            return 0
+        ids = np.asarray(ids, dtype=np.int64)
+        i = np.searchsorted(starts, ids, side='right') - 1
+        fresh = (i >= 0) & (ids <= ends[np.maximum(i, 0)])
+        return int(np.count_nonzero(fresh))
+
+    @staticmethod
+    def fresh_ingredient_id_count(ranges, ids, run_size=None):
+        # Pass run_size to merge through temporary files when ranges is too big to
+        # sort in memory; the merged ranges are then totalled as they stream in.
+        if run_size is None:
+            merged_ranges = Day5Part2.merge_ranges(ranges)
+        else:
+            merged_ranges = Day5Part2.merge_ranges_external(ranges, run_size)
         count = 0
         for r in merged_ranges:
             count += r[1] - r[0] + 1
             print(f"count = {count}") if Day5Part2.DEBUG else None
         return count
     
+class IntervalSet:
+    # The fresh-ingredient database as a set of IDs that can be updated in place.
+    # It stores disjoint inclusive ranges, sorted, in two parallel lists of starts
+    # and ends. Touching ranges are joined, so 3-5 and 6-8 are kept as 3-8. Finding
+    # the ranges an update touches is a binary search; splicing the lists is a
+    # single memmove. count is the number of IDs covered, kept current as ranges
+    # are added and removed.
+    def __init__(self, ranges=()):
+        self.starts, self.ends = [], []
+        self.count = 0
+        for start, end in Day5Part2.merge_ranges(list(ranges)):
+            self.add(start, end)
+
+    def add(self, start, end):
+        if start > end:
+            raise ValueError("start must not be after end")
+        i = bisect_left(self.ends, start - 1) # first range that ends at or after start - 1
+        j = bisect_right(self.starts, end + 1) # ranges i..j-1 overlap or touch [start, end]
+        if i < j:
+            start = min(start, self.starts[i])
+            end = max(end, self.ends[j-1])
+            self.count -= self.covered(i, j)
+        self.starts[i:j] = [start]
+        self.ends[i:j] = [end]
+        self.count += end - start + 1
+
+    def remove(self, start, end):
+        if start > end:
+            raise ValueError("start must not be after end")
+        i = bisect_left(self.ends, start) # first range that ends at or after start
+        j = bisect_right(self.starts, end) # ranges i..j-1 overlap [start, end]
+        if i >= j:
+            return
+        new_starts, new_ends = [], []
+        if self.starts[i] < start: # keep the part to the left of the removed range
+            new_starts.append(self.starts[i])
+            new_ends.append(start - 1)
+        if self.ends[j-1] > end: # and the part to the right
+            new_starts.append(end + 1)
+            new_ends.append(self.ends[j-1])
+        self.count -= self.covered(i, j)
+        self.starts[i:j] = new_starts
+        self.ends[i:j] = new_ends
+        self.count += sum(e - s + 1 for s, e in zip(new_starts, new_ends))
+
+    def covered(self, i, j):
+        return sum(self.ends[k] - self.starts[k] + 1 for k in range(i, j))
+
+    def __contains__(self, id):
+        i = bisect_right(self.starts, id) - 1
+        return i >= 0 and id <= self.ends[i]
+
+    def __iter__(self):
+        return zip(self.starts, self.ends)
+
+    def __len__(self):
+        return len(self.starts)
+
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
     if len(sys.argv) == 2:
@@ -52,12 +220,13 @@ if __name__ == "__main__":
             print(f"Usage: python {sys.argv[0]} <input_filename>")
             sys.exit(1)
   
-    input_text = open(input_filename).read()
-    ranges, ids = Day5Part1.parse_input(input_text)     
+    # Part 2 only needs the ranges, so stop reading at the blank line.
+    with open(input_filename) as f:
+        starts, ends = Day5Part1.read_ranges(f)
 
     # merged_ranges = Day5Part2.merge_ranges(ranges)
     # print(f"Merged ranges: {merged_ranges}")
 
-    result = Day5Part2.fresh_ingredient_id_count(ranges, ids)
+    result = Day5Part2.fresh_ingredient_id_count(zip(starts, ends), None)
     print(f"Day 5 Part 2 result: {result}")
 
@@ -1,20 +1,103 @@
-import sys, os
+import sys, os, re, mmap, math
+from itertools import chain
+
+BLOCK_SIZE = 1 << 16 # columns read from every row at a time when streaming
+
+# bytes.translate table that turns a space into 0 and anything else into 1
+NOT_BLANK = bytes(0 if b == ord(' ') else 1 for b in range(256))
+NON_SPACE = re.compile(rb'\S') # searched in place on the mmap, so blank lines are spotted without copying them
+REDUCTIONS = {'+': sum, '*': math.prod} # operator -> reduction over a problem's numbers
 
 class Day6Part1:
     DEBUG = False
 
     @staticmethod
     def parse_input(input_text):
-        lines = input_text.splitlines()
-        problems = []
-        for i, line in enumerate(lines):
-            print(f"line: {line}") if Day6Part1.DEBUG else None
-            for j, item in enumerate(line.split()):
-                if len(problems) <= j:
-                    problems.append([])
-                item = int(item) if item.isdigit() else item
-                problems[j].append(item)
-                print(f"problems: {problems}") if Day6Part1.DEBUG else None
+        return Day6Part1.row_problems(Day6Part1.load_worksheet(input_text))
+
+    @staticmethod
+    def load_worksheet(input_text):
+        # The worksheet as a matrix of bytes: one bytes object per line, padded with
+        # spaces so every row has the same width. Both parts read their numbers
+        # from this same matrix.
+        lines = [line.encode() for line in input_text.splitlines() if line.strip()]
+        width = max((len(line) for line in lines), default=0)
+        return [line.ljust(width) for line in lines]
+
+    @staticmethod
+    def problem_spans(rows):
+        # Returns (start, end) column ranges of the problems. Problems are separated
+        # by all-blank columns, which are found for every column at once: each row
+        # becomes one big int with a 1 byte wherever it isn't blank, and OR-ing the
+        # rows leaves a 0 byte only in the blank columns.
+        if not rows:
+            return []
+        used = 0
+        for row in rows:
+            used |= int.from_bytes(row.translate(NOT_BLANK), 'big')
+        columns = used.to_bytes(len(rows[0]), 'big')
+        return [match.span() for match in re.finditer(b'\x01+', columns)]
+
+    @staticmethod
+    def stream_problems(input_filename, block_size=BLOCK_SIZE):
+        # Yields the problems one at a time, left to right, without loading the whole
+        # worksheet. The file is memory-mapped and each line gets its own cursor.
+        # All the cursors move right together a block of columns at a time, and a
+        # problem is yielded (as one bytes slice per row) as soon as the blank
+        # column after it is seen. Memory stays around one block plus the widest
+        # problem.
+        with open(input_filename, 'rb') as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return
+            with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+                lines = [] # (start, end) offset of every non-empty line
+                start = 0
+                while start < len(data):
+                    end = data.find(b'\n', start)
+                    if end == -1:
+                        end = len(data)
+                    line_end = end - 1 if end > start and data[end-1] == ord('\r') else end
+                    if NON_SPACE.search(data, start, line_end):
+                        lines.append((start, line_end))
+                    start = end + 1
+                width = max((end - start for start, end in lines), default=0)
+
+                problem = None # the rows of the problem being read, once one has started
+                for column in range(0, width, block_size):
+                    block_width = min(block_size, width - column)
+                    block = [data[start + column:min(end, start + column + block_width)].ljust(block_width)
+                             for start, end in lines]
+                    previous_end = 0
+                    for span_start, span_end in Day6Part1.problem_spans(block):
+                        if span_start > previous_end and problem: # blank column(s) before this span
+                            yield problem
+                            problem = None
+                        pieces = [row[span_start:span_end] for row in block]
+                        problem = pieces if problem is None else [a + b for a, b in zip(problem, pieces)]
+                        previous_end = span_end
+                    if previous_end < block_width and problem: # the block ends on a blank column
+                        yield problem
+                        problem = None
+                if problem:
+                    yield problem
+
+    @staticmethod
+    def total_result_streaming(input_filename):
+        return sum(Day6Part1.total_result(Day6Part1.row_problems(rows))
+                   for rows in Day6Part1.stream_problems(input_filename))
+
+    @staticmethod
+    def row_problems(rows):
+        # Part 1 reading: the n-th item on every row belongs to the n-th problem, so
+        # split each row once and transpose. This doesn't need the blank columns,
+        # which keeps it working on rows that aren't lined up.
+        if not rows:
+            return []
+        number_rows, operator_row = rows[:-1], rows[-1]
+        columns = zip(*([int(item) for item in row.split()] for row in number_rows),
+                      (item.decode() for item in operator_row.split()))
+        problems = [list(column) for column in columns]
+        print(f"problems: {problems}") if Day6Part1.DEBUG else None
         return problems
 
     @staticmethod
@@ -23,21 +106,18 @@ class Day6Part1:
         operation = problem[-1]
         numbers = problem[0:-1]
         print(f"problem: {problem} operation: {operation} numbers: {numbers}") if Day6Part1.DEBUG else None
-        if operation == '*':
-            result = 1
-            for num in numbers:
-                result *= num
-        elif operation == '+':
-            result = sum(numbers)
-        return result
+        return REDUCTIONS[operation](numbers)
 
     @staticmethod
     def total_result(problems):
-        total = 0
+        # Reduces all the problems in bulk rather than one at a time: the additions
+        # collapse into a single sum over all their numbers, and the products are
+        # math.prod over each problem's numbers. These stay Python ints rather
+        # than a numpy int64 reduction because the products can overflow int64.
+        groups = {operation: [] for operation in REDUCTIONS}
         for problem in problems:
-            result = Day6Part1.solve_problem(problem)
-            total += result
-        return total
+            groups[problem[-1]].append(problem[:-1])
+        return sum(chain.from_iterable(groups['+'])) + sum(map(math.prod, groups['*']))
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
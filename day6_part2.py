@@ -1,68 +1,49 @@
 import sys, os
 from functools import reduce
+from day6_part1 import Day6Part1, REDUCTIONS # both parts read problems from the same worksheet matrix
 
 class Day6Part2:
     DEBUG = False
 
     @staticmethod
     def parse_input(input_text):
-        lines = input_text.splitlines()
-        max_col_index = 0 # index of right-most column
-        for line in lines:
-            print(f"'{line}'") if Day6Part2.DEBUG else None
-            max_col_index = len(line) if len(line) > max_col_index else max_col_index
-        max_col_index -= 1
-        print(f"max_col_index={max_col_index}") if Day6Part2.DEBUG else None  
-        num_count = len(lines) - 1 # If there are 4 lines of input, the first 3 are numbers
-        op_index = len(lines) - 1  # Index 3 is the line of operations on the numbers (+ or *)
-        problems = [ [] ]
-        problem_index = 0
-        
-        for col in range(max_col_index, -1, -1): # Step from max_col_index (14) down to 0
-            digits, operation = '', ''
-            for i in range(len(lines)):
-                print(f"i={i}, col={col}, len(lines[{i}])={len(lines[i])}, {lines[i]}") if Day6Part2.DEBUG else None
-                if col < len(lines[i]):
-                    digit = lines[i][col]
-                else:
-                    digit = '' # some lines appear to be a character shorter
-                if digit.isdigit():
-                    digits += digit
-                    print(f"Found digit {digit}, digits is now {digits}") if Day6Part2.DEBUG else None
-                elif digit in ['+', '*']:
-                    operation = digit
-            if not digits: # there was nothing in this column
-                print(f"Ended problem[{problem_index}]: {problems[problem_index]}") if Day6Part2.DEBUG else None
-                problems.append([])
-                problem_index += 1
-            else:
-                print(f"Appending {digits} to problems[{problem_index}]") if Day6Part2.DEBUG else None
-                problems[problem_index].append(int(digits))
-                if operation:
-                    problems[problem_index].append(operation)
-        
+        rows = Day6Part1.load_worksheet(input_text)
+        return Day6Part2.column_problems(rows, Day6Part1.problem_spans(rows))
+
+    @staticmethod
+    def column_problems(rows, spans):
+        # Part 2 reading: each column of a problem is one number, read top to bottom,
+        # and problems are read from the right-most column to the left.
+        number_rows, operator_row = rows[:-1], rows[-1]
+        problems = []
+        for start, end in reversed(spans):
+            columns = [bytes(column).replace(b' ', b'') for column in zip(*(row[start:end] for row in number_rows))]
+            problem = [int(digits) for digits in reversed(columns) if digits]
+            problem.append(operator_row[start:end].strip().decode())
+            print(f"problem: {problem}") if Day6Part2.DEBUG else None
+            problems.append(problem)
         return problems
 
+    @staticmethod
+    def total_result_streaming(input_filename):
+        # The grand total doesn't depend on the order, so the problems can be
+        # solved left to right as Day6Part1.stream_problems produces them.
+        total = 0
+        for rows in Day6Part1.stream_problems(input_filename):
+            total += Day6Part2.total_result(Day6Part2.column_problems(rows, [(0, len(rows[0]))]))
+        return total
+
     @staticmethod
     def solve_problem(problem):
         operation = problem[-1]
         numbers = problem[0:-1]
         print(f"problem: {problem} operation: {operation} numbers: {numbers}") if Day6Part2.DEBUG else None
-        if operation == '*':
-            result = 1
-            for num in numbers:
-                result *= num
-        elif operation == '+':
-            result = sum(numbers)
-        return result
+        return REDUCTIONS[operation](numbers)
 
     @staticmethod
     def total_result(problems):
-        total = 0
-        for problem in problems:
-            result = Day6Part2.solve_problem(problem)
-            total += result
-        return total
+        # Problems are [numbers..., operator] in both parts, so Part 1's bulk reduction works here too.
+        return Day6Part1.total_result(problems)
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
@@ -1,5 +1,9 @@
 import sys, os
 from functools import reduce
+from itertools import islice
+
+# bytes.translate table that turns '^' into '1' and everything else into '0'
+SPLITTER_BITS = bytes(ord('1') if b == ord('^') else ord('0') for b in range(256))
 
 class Day7Part1:
     DEBUG = False
@@ -65,6 +69,30 @@ class Day7Part1:
             print(f"New line: {lines[n]}") if Day7Part1.DEBUG else None
         return split_count
 
+    @staticmethod
+    def splitter_bitsets(lines):
+        # One int per row, with bit x set when there's a splitter in column x. A
+        # generator, so only the row being swept is ever held as a bitset.
+        for line in lines:
+            yield int(line.encode().translate(SPLITTER_BITS)[::-1] or b'0', 2)
+
+    @staticmethod
+    def count_splits(lines):
+        # Same answer as iterate_tachyon_beam, but the beams on a row are a bitset
+        # too, so a whole row is handled with a few shifts and masks instead of
+        # string surgery on every beam.
+        start = lines[0].find('S')
+        if start == -1:
+            return 0
+        beams = 1 << start
+        split_count = 0
+        for splitters in Day7Part1.splitter_bitsets(islice(lines, 1, None)):
+            hits = beams & splitters
+            if hits:
+                split_count += bin(hits).count('1')
+                beams = (beams & ~hits) | (hits << 1) | (hits >> 1)
+        return split_count
+
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
     if len(sys.argv) == 2:
@@ -81,6 +109,6 @@ if __name__ == "__main__":
   
     input_text = open(input_filename).read()
     lines = Day7Part1.parse_input(input_text)     
-    result = Day7Part1.iterate_tachyon_beam(lines)
+    result = Day7Part1.count_splits(lines)
     print(f"Day 7 Part 1 result: {result}")
 
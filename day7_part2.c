@@ -1,60 +1,86 @@
 // C conversion of day7_part2.py.
 
-// In Developer Powershell for VS 2019:
+// Standalone, in Developer Powershell for VS 2019:
 // cl day7_part2.c; .\day7_part2.exe day7_input_dean.txt
+// or with gcc/clang:
+// cc -O2 -o day7_part2 day7_part2.c; ./day7_part2 day7_input_dean.txt
+
+// As the shared library day7_part2.py loads when it is there (not day7_part2.so,
+// which Python would try to import in place of day7_part2.py):
+// cc -O2 -shared -fPIC -DDAY7_PART2_NO_MAIN -o libday7_part2.so day7_part2.c
+// cl /O2 /LD /DDAY7_PART2_NO_MAIN day7_part2.c
 
 #include <stdio.h>
 #include <stdlib.h>
 #include <string.h>
-#include <time.h>
 
-// Full data is 142x142
-#define MAX_LINES 150
-#define MAX_LINE_LENGTH 150
+#ifdef _WIN32
+#define DAY7_EXPORT __declspec(dllexport)
+#else
+#define DAY7_EXPORT
+#endif
 
-// Globals for progress
-int DEBUG = 0;
-double start_time = 0;
-double last_progress_time = 0;
+// Return codes for sweep_lines and day7_sweep
+#define DAY7_OK 0
+#define DAY7_OVERFLOW 1  // more timelines than fit in 64 bits; Python has to do it with big ints
+#define DAY7_NO_MEMORY 2
 
-void parse_input(const char* input_text, char lines[][MAX_LINE_LENGTH], int* num_lines);
+char** parse_input(const char* input_text, size_t length, int* num_lines);
+void free_lines(char** lines, int num_lines);
 void find_item_indices(const char* line, char item, int* items, int* num_items);
-void print_progress(unsigned long long count);
-long iterate(int* all_beams, int** all_splitters, int n, long count, int num_lines);
-unsigned long long iterate_tachyon_beam(char lines[][MAX_LINE_LENGTH], int num_lines);
-
-
-void parse_input(const char* input_text, char lines[][MAX_LINE_LENGTH], int* num_lines) {
-    // Split input_text into lines, store in lines array, set num_lines
-    int line_idx = 0, char_idx = 0;
-    const char* p = input_text;
-    while (*p) {
-        if (*p == '\n' || *p == '\r') {
-            if (char_idx > 0) {
-                lines[line_idx][char_idx] = '\0';
-                line_idx++;
-                char_idx = 0;
-            }
-            // Handle \r\n or \n\r
-            if ((*p == '\r' && *(p+1) == '\n') || (*p == '\n' && *(p+1) == '\r')) {
-                p++;
-            }
-        } else {
-            if (char_idx < MAX_LINE_LENGTH-1) {
-                lines[line_idx][char_idx++] = *p;
-            }
+int sweep_lines(char** lines, int num_lines, unsigned long long* split_count, unsigned long long* timeline_count);
+DAY7_EXPORT int day7_sweep(const char* input_text, size_t length, unsigned long long* split_count, unsigned long long* timeline_count);
+
+
+char** parse_input(const char* input_text, size_t length, int* num_lines) {
+    // Split input_text into lines the way Python's splitlines does for \n, \r\n and
+    // \r: blank lines are kept, but there is no empty line after a trailing newline.
+    // Every line is allocated to its own length. Returns NULL if malloc fails.
+    int count = 0;
+    for (size_t i = 0; i < length; ++i) {
+        if (input_text[i] == '\n' || (input_text[i] == '\r' && (i + 1 == length || input_text[i+1] != '\n'))) {
+            count++;
         }
-        p++;
     }
-    if (char_idx > 0) {
-        lines[line_idx][char_idx] = '\0';
+    if (length > 0 && input_text[length-1] != '\n' && input_text[length-1] != '\r') {
+        count++; // last line has no newline
+    }
+    char** lines = (char**)malloc((count > 0 ? count : 1) * sizeof(char*));
+    if (!lines) {
+        return NULL;
+    }
+    int line_idx = 0;
+    size_t line_start = 0;
+    for (size_t i = 0; i <= length && line_idx < count; ++i) {
+        if (i < length && input_text[i] != '\n' && input_text[i] != '\r') {
+            continue;
+        }
+        size_t line_length = i - line_start;
+        lines[line_idx] = (char*)malloc(line_length + 1);
+        if (!lines[line_idx]) {
+            free_lines(lines, line_idx);
+            return NULL;
+        }
+        memcpy(lines[line_idx], input_text + line_start, line_length);
+        lines[line_idx][line_length] = '\0';
         line_idx++;
+        if (i + 1 < length && input_text[i] == '\r' && input_text[i+1] == '\n') {
+            i++;
+        }
+        line_start = i + 1;
     }
     *num_lines = line_idx;
+    return lines;
+}
+
+void free_lines(char** lines, int num_lines) {
+    for (int i = 0; i < num_lines; ++i) free(lines[i]);
+    free(lines);
 }
 
 void find_item_indices(const char* line, char item, int* items, int* num_items) {
-    // Find all indices of 'item' in 'line', store in 'items', set 'num_items'
+    // Find all indices of 'item' in 'line', store in 'items', set 'num_items'.
+    // items needs room for strlen(line) entries.
     int idx = 0;
     int found = 0;
     while (line[idx] != '\0') {
@@ -66,110 +92,83 @@ void find_item_indices(const char* line, char item, int* items, int* num_items)
     *num_items = found;
 }
 
-void print_progress(unsigned long long count) {
-    // Print progress every 2 seconds: count, elapsed time, and rate, with commas (portable)
-    double now = (double)clock() / CLOCKS_PER_SEC;
-    if (start_time == 0) {
-        start_time = now;
-        last_progress_time = now;
+int sweep_lines(char** lines, int num_lines, unsigned long long* split_count, unsigned long long* timeline_count) {
+    // Same row-by-row sweep as Day7Part2.sweep: timelines[x + 1] is how many
+    // timelines have a beam in column x, with a slot at each end for beams that
+    // have left the manifold.
+    *split_count = 0;
+    *timeline_count = 0;
+    if (num_lines == 0) {
+        return DAY7_OK;
     }
-    double elapsed = now - start_time;
-    if (now - last_progress_time > 2.0) {
-        double rate = (elapsed > 0) ? (count / elapsed) : 0.0;
-        printf("%llu splits in %.2f secs: %.2f / sec          \r", count, elapsed, rate);
-        fflush(stdout);
-        last_progress_time = now;
+    const char* start = strchr(lines[0], 'S');
+    if (!start) {
+        return DAY7_OK;
     }
-}
-
-long iterate(int* all_beams, int** all_splitters, int n, long count, int num_lines) {
-    // In-place backtracking version (no array copies)
-    if (count % 1000000 == 0) {
-        print_progress(count);
+    size_t width = 0;
+    for (int i = 0; i < num_lines; ++i) {
+        size_t line_length = strlen(lines[i]);
+        if (line_length > width) width = line_length;
     }
-    if (n == num_lines) {
-        return count;
+    unsigned long long* timelines = (unsigned long long*)calloc(width + 2, sizeof(unsigned long long));
+    int* splitters = (int*)malloc((width + 1) * sizeof(int));
+    int* hits = (int*)malloc((width + 1) * sizeof(int));
+    unsigned long long* hit_counts = (unsigned long long*)malloc((width + 1) * sizeof(unsigned long long));
+    if (!timelines || !splitters || !hits || !hit_counts) {
+        free(timelines); free(splitters); free(hits); free(hit_counts);
+        return DAY7_NO_MEMORY;
     }
-    int prev_beam_idx = all_beams[n-1];
-    int* splitters = all_splitters[n];
-    int num_splitters = 0;
-    while (num_splitters < MAX_LINE_LENGTH && splitters[num_splitters] != -1) num_splitters++;
-
-    if (num_splitters > 0) {
-        int no_splitter = 1;
+    timelines[start - lines[0] + 1] = 1;
+    unsigned long long total = 1, splits = 0;
+    int status = DAY7_OK;
+    for (int n = 1; n < num_lines && status == DAY7_OK; ++n) {
+        int num_splitters = 0, num_hits = 0;
+        find_item_indices(lines[n], '^', splitters, &num_splitters);
         for (int i = 0; i < num_splitters; ++i) {
-            int splitter = splitters[i];
-            if (splitter == prev_beam_idx) {
-                no_splitter = 0;
-                // propagate left (same timeline)
-                int old_val = all_beams[n];
-                all_beams[n] = splitter - 1;
-                count = iterate(all_beams, all_splitters, n+1, count, num_lines);
-                // propagate right (new timeline, count + 1)
-                all_beams[n] = splitter + 1;
-                count = iterate(all_beams, all_splitters, n+1, count+1, num_lines);
-                all_beams[n] = old_val; // backtrack
+            unsigned long long count = timelines[splitters[i] + 1];
+            if (count) {
+                hits[num_hits] = splitters[i];
+                hit_counts[num_hits++] = count;
             }
         }
-        if (no_splitter) {
-            if (prev_beam_idx == -1) {
-                return count;
-            }
-            int old_val = all_beams[n];
-            all_beams[n] = prev_beam_idx;
-            count = iterate(all_beams, all_splitters, n+1, count, num_lines);
-            all_beams[n] = old_val; // backtrack
+        // Clear every hit splitter before handing out timelines, so a beam sent
+        // sideways onto a neighbouring splitter carries on down instead.
+        for (int i = 0; i < num_hits; ++i) {
+            timelines[hits[i] + 1] = 0;
         }
-    } else {
-        if (prev_beam_idx == -1) {
-            return count;
+        for (int i = 0; i < num_hits; ++i) {
+            // No column holds more than the total, so checking the total is enough.
+            if (hit_counts[i] > ~0ULL - total) {
+                status = DAY7_OVERFLOW;
+                break;
+            }
+            total += hit_counts[i];
+            timelines[hits[i]] += hit_counts[i];
+            timelines[hits[i] + 2] += hit_counts[i];
         }
-        int old_val = all_beams[n];
-        all_beams[n] = prev_beam_idx;
-        count = iterate(all_beams, all_splitters, n+1, count, num_lines);
-        all_beams[n] = old_val; // backtrack
+        splits += num_hits;
     }
-    return count;
-}
-
-unsigned long long iterate_tachyon_beam(char lines[][MAX_LINE_LENGTH], int num_lines) {
-    // Find all splitters for each line
-    int* all_splitters[MAX_LINES];
-    int num_splitters[MAX_LINES];
-    for (int i = 0; i < num_lines; ++i) {
-        all_splitters[i] = (int*)malloc(MAX_LINE_LENGTH * sizeof(int));
-        find_item_indices(lines[i], '^', all_splitters[i], &num_splitters[i]);
-        // Initialize unused elements to -1
-        for (int j = num_splitters[i]; j < MAX_LINE_LENGTH; ++j) {
-            all_splitters[i][j] = -1;
-        }
+    free(timelines); free(splitters); free(hits); free(hit_counts);
+    if (status == DAY7_OK) {
+        *split_count = splits;
+        *timeline_count = total;
     }
+    return status;
+}
 
-    // Find the start index 'S' in the first line
-    int start = -1;
-    for (int i = 0; lines[0][i] != '\0'; ++i) {
-        if (lines[0][i] == 'S') {
-            start = i;
-            break;
-        }
-    }
-    if (start == -1) {
-        for (int i = 0; i < num_lines; ++i) free(all_splitters[i]);
-        return 0;
+DAY7_EXPORT int day7_sweep(const char* input_text, size_t length, unsigned long long* split_count, unsigned long long* timeline_count) {
+    // Entry point for the Python binding: the whole manifold as text.
+    int num_lines = 0;
+    char** lines = parse_input(input_text, length, &num_lines);
+    if (!lines) {
+        return DAY7_NO_MEMORY;
     }
-
-    // Prepare all_beams array
-    int all_beams[MAX_LINES];
-    all_beams[0] = 0;
-    all_beams[1] = start;
-    for (int i = 2; i < num_lines; ++i) all_beams[i] = 0;
-
-    long result = iterate(all_beams, all_splitters, 2, 1, num_lines);
-
-    for (int i = 0; i < num_lines; ++i) free(all_splitters[i]);
-    return result;
+    int status = sweep_lines(lines, num_lines, split_count, timeline_count);
+    free_lines(lines, num_lines);
+    return status;
 }
 
+#ifndef DAY7_PART2_NO_MAIN
 int main(int argc, char* argv[]) {
     if (argc < 2) {
         printf("Usage: %s <input_filename>\n", argv[0]);
@@ -191,20 +190,30 @@ int main(int argc, char* argv[]) {
         fclose(f);
         return 1;
     }
-    fread(input_text, 1, fsize, f);
-    input_text[fsize] = '\0';
+    size_t length = fread(input_text, 1, fsize, f);
     fclose(f);
 
     // Parse input into lines
-    char lines[MAX_LINES][MAX_LINE_LENGTH];
     int num_lines = 0;
-    parse_input(input_text, lines, &num_lines);
+    char** lines = parse_input(input_text, length, &num_lines);
+    free(input_text);
+    if (!lines) {
+        printf("Memory allocation failed.\n");
+        return 1;
+    }
     printf("Read %d lines from %s\n", num_lines, argv[1]);
 
-    // Call iterate_tachyon_beam and print the result
-    unsigned long long result = iterate_tachyon_beam(lines, num_lines);
-    printf("\nDay 7 Part 2 result: %llu\n", result);
-
-    free(input_text);
+    unsigned long long split_count = 0, timeline_count = 0;
+    int status = sweep_lines(lines, num_lines, &split_count, &timeline_count);
+    free_lines(lines, num_lines);
+    if (status == DAY7_OVERFLOW) {
+        printf("Too many timelines for 64 bits; use day7_part2.py\n");
+        return 1;
+    } else if (status != DAY7_OK) {
+        printf("Memory allocation failed.\n");
+        return 1;
+    }
+    printf("Day 7 Part 2 result: %llu\n", timeline_count);
     return 0;
 }
+#endif
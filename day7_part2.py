@@ -1,4 +1,25 @@
-import sys, os, time
+import sys, os, time, ctypes
+from itertools import islice
+
+try:
+    import numpy as np
+except ImportError: # without numpy, sweep does all the work
+    np = None
+
+VECTORIZE_WIDTH = 4096 # manifolds at least this wide use sweep_vectorized when numpy is available
+
+# The sweep from day7_part2.c, if it has been built as a shared library next to this file:
+# cc -O2 -shared -fPIC -DDAY7_PART2_NO_MAIN -o libday7_part2.so day7_part2.c
+NATIVE_LIBRARY = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                              'day7_part2.dll' if os.name == 'nt' else 'libday7_part2.so')
+NATIVE_OK, NATIVE_OVERFLOW = 0, 1 # DAY7_OK and DAY7_OVERFLOW in day7_part2.c
+try:
+    native = ctypes.CDLL(NATIVE_LIBRARY)
+    native.day7_sweep.argtypes = [ctypes.c_char_p, ctypes.c_size_t,
+                                  ctypes.POINTER(ctypes.c_ulonglong), ctypes.POINTER(ctypes.c_ulonglong)]
+    native.day7_sweep.restype = ctypes.c_int
+except (OSError, AttributeError): # not built (or built without day7_sweep); use the Python sweeps
+    native = None
 
 class Day7Part2:
     DEBUG = False
@@ -140,7 +161,14 @@ class Day7Part2:
 
     @staticmethod
     def iterate_tachyon_beam(lines):
-        return Day7Part2.iterate_tachyon_beam_optimized(lines)
+        result = Day7Part2.sweep_native(lines) if native is not None else None
+        if result is not None:
+            split_count, timeline_count = result
+        elif np is not None and max(len(line) for line in lines) >= VECTORIZE_WIDTH:
+            split_count, timeline_count = Day7Part2.sweep_vectorized(lines)
+        else:
+            split_count, timeline_count = Day7Part2.sweep(lines)
+        return timeline_count
     #     all_splitters = [Day7Part2.find_item_indices(line,'^') for line in lines]
     #     start = lines[0].find('S')
     #     if start == -1:
@@ -149,6 +177,90 @@ class Day7Part2:
     #     timeline_count = Day7Part2.iterate(lines, all_splitters, 2, 1, '')
     #     return timeline_count
 
+    @staticmethod
+    def sweep(lines):
+        # Goes down the manifold one row at a time, keeping how many timelines have
+        # a beam in each column. A splitter hands its column's timelines to both
+        # neighbours, so the work is rows x columns with no recursion and no
+        # copying. Returns (split_count, timeline_count): the number of splitters
+        # any beam reaches (part 1) and the number of timelines at the end (part 2).
+        start = lines[0].find('S')
+        if start == -1:
+            return 0, 0
+        width = max(len(line) for line in lines)
+        # Column x is at index x + 1. The extra slot at each end holds timelines
+        # whose beam has left the manifold; they still count at the end.
+        timelines = [0] * (width + 2)
+        timelines[start + 1] = 1
+        split_count = 0
+        for line in lines[1:]:
+            hits = [] # (column, timelines) for every splitter a beam reaches on this row
+            splitter = line.find('^')
+            while splitter >= 0:
+                if timelines[splitter + 1]:
+                    hits.append((splitter, timelines[splitter + 1]))
+                splitter = line.find('^', splitter + 1)
+            # Clear every hit splitter before handing out timelines, so a beam sent
+            # sideways onto a neighbouring splitter carries on down instead.
+            for splitter, count in hits:
+                timelines[splitter + 1] = 0
+            for splitter, count in hits:
+                timelines[splitter] += count
+                timelines[splitter + 2] += count
+            split_count += len(hits)
+        return split_count, sum(timelines)
+
+    @staticmethod
+    def splitter_index(lines):
+        # Sorted splitter columns for each row in turn, as numpy int arrays. Rows
+        # are done one at a time so only the current one is held.
+        for line in lines:
+            yield np.flatnonzero(np.frombuffer(line.encode(), dtype=np.uint8) == ord('^'))
+
+    @staticmethod
+    def sweep_vectorized(lines):
+        # Same as sweep, but each row is a few numpy operations instead of a Python
+        # loop over its splitters. Finding the splitters still reads (and encodes
+        # a copy of) the whole row, so a row costs its width, just in C rather
+        # than in Python. Counts start out as int64 and switch to Python ints
+        # (object arrays) once the total gets close to overflowing.
+        start = lines[0].find('S')
+        if start == -1:
+            return 0, 0
+        width = max(len(line) for line in lines)
+        timelines = np.zeros(width + 2, dtype=np.int64) # column x is at index x + 1, as in sweep
+        timelines[start + 1] = 1
+        total, split_count = 1, 0
+        for splitters in Day7Part2.splitter_index(islice(lines, 1, None)):
+            if splitters.size == 0:
+                continue
+            counts = timelines[splitters + 1]
+            reached = counts != 0
+            if not reached.any():
+                continue
+            hits, counts = splitters[reached], counts[reached]
+            timelines[hits + 1] = 0
+            np.add.at(timelines, hits, counts) # add.at because neighbouring splitters can share a column
+            np.add.at(timelines, hits + 2, counts)
+            split_count += int(hits.size)
+            total += int(counts.sum()) # every split adds one more timeline per incoming one
+            if total > 2**61 and timelines.dtype != object:
+                timelines = timelines.astype(object)
+        return split_count, total
+
+    @staticmethod
+    def sweep_native(lines):
+        # sweep in C. Returns None when the answer doesn't fit in 64 bits, so the
+        # caller can redo it with Python ints.
+        text = '\n'.join(lines).encode()
+        split_count, timeline_count = ctypes.c_ulonglong(), ctypes.c_ulonglong()
+        status = native.day7_sweep(text, len(text), ctypes.byref(split_count), ctypes.byref(timeline_count))
+        if status == NATIVE_OVERFLOW:
+            return None
+        if status != NATIVE_OK:
+            raise MemoryError("day7_sweep could not allocate its buffers")
+        return split_count.value, timeline_count.value
+
     @staticmethod
     def iterate_tachyon_beam_optimized(lines):
         # lightweight optimized entry that reuses the recursive iterate implementation
@@ -178,6 +290,6 @@ if __name__ == "__main__":
 
     input_text = open(input_filename).read()
     lines = Day7Part2.parse_input(input_text)
-    result = Day7Part2.iterate_tachyon_beam_optimized(lines)
+    result = Day7Part2.iterate_tachyon_beam(lines)
     print(f"Day 7 Part 2 result: {result}")
 
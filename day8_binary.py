@@ -0,0 +1,134 @@
+import sys, os, mmap, struct
+from array import array
+from collections.abc import Sequence
+from day8_part1 import parse_junction
+
+try:
+    import numpy as np
+except ImportError: # without numpy, PointCloud columns are plain memoryviews
+    np = None
+
+# Binary junction files: a 24-byte little-endian header (magic, version, a zero
+# reserved word, point count) and then three columns of int32, all the x's, then
+# all the y's, then all the z's. Loading one is an mmap and no parsing.
+MAGIC = b'AOC8PTS\0'
+VERSION = 1
+HEADER = struct.Struct('<8sIIQ')
+READ_BLOCK = 1 << 20 # characters per read when converting a text file
+
+class PointCloud(Sequence):
+    # Read-only sequence of (x, y, z) tuples backed by a memory-mapped binary file,
+    # so it can stand in for the list parse_input returns. The columns are
+    # zero-copy views of the file (numpy arrays when numpy is available).
+    def __init__(self, filename):
+        with open(filename, 'rb') as f:
+            header = f.read(HEADER.size)
+            if len(header) < HEADER.size:
+                raise ValueError(f"{filename} is too short to be a junction file")
+            magic, version, reserved, count = HEADER.unpack(header)
+            if magic != MAGIC:
+                raise ValueError(f"{filename} is not a junction file")
+            if version != VERSION:
+                raise ValueError(f"{filename} is version {version}; only version {VERSION} is supported")
+            if os.fstat(f.fileno()).st_size < HEADER.size + 12 * count:
+                raise ValueError(f"{filename} is truncated: expected {count} points")
+            self.count = count
+            self.map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if count else None
+        self.x, self.y, self.z = (self.column(axis) for axis in range(3))
+
+    def column(self, axis):
+        if not self.count:
+            return np.empty(0, dtype=np.int32) if np is not None else array('i')
+        offset = HEADER.size + 4 * self.count * axis
+        if np is not None:
+            return np.frombuffer(self.map, dtype='<i4', count=self.count, offset=offset)
+        view = memoryview(self.map)[offset:offset + 4 * self.count]
+        if sys.byteorder == 'little':
+            return view.cast('i')
+        values = array('i', view) # big-endian machine: a swapped copy instead of a view
+        values.byteswap()
+        return values
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self.count))]
+        if index < 0:
+            index += self.count
+        if not 0 <= index < self.count:
+            raise IndexError("point index out of range")
+        return int(self.x[index]), int(self.y[index]), int(self.z[index])
+
+    def __iter__(self):
+        for x, y, z in zip(self.x, self.y, self.z):
+            yield int(x), int(y), int(z)
+
+    def __array__(self, dtype=None, copy=None):
+        # An (n, 3) array for numpy callers such as closest_pair_indices_vectorized.
+        return np.column_stack((self.x, self.y, self.z)).astype(dtype or np.int32, copy=False)
+
+    def close(self):
+        # Views have to be let go of before the map can be closed, so this fails
+        # with BufferError while a caller still holds one of the columns.
+        columns, self.x, self.y, self.z = [self.x, self.y, self.z], None, None, None
+        while columns:
+            column = columns.pop()
+            if isinstance(column, memoryview):
+                column.release()
+            del column
+        if self.map is not None:
+            self.map.close()
+            self.map = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+def write_point_cloud(points, output_filename):
+    columns = [array('i') for axis in range(3)]
+    for point in points:
+        for column, value in zip(columns, point):
+            column.append(value) # OverflowError if a coordinate doesn't fit in int32
+    if sys.byteorder != 'little':
+        for column in columns:
+            column.byteswap()
+    with open(output_filename, 'wb') as f:
+        f.write(HEADER.pack(MAGIC, VERSION, 0, len(columns[0])))
+        for column in columns:
+            column.tofile(f)
+
+def read_junctions(input_filename):
+    # Streams junctions out of a text file one line at a time.
+    with open(input_filename) as f:
+        partial = ''
+        for block in iter(lambda: f.read(READ_BLOCK), ''):
+            lines = (partial + block).split('\n')
+            partial = lines.pop()
+            for line in lines:
+                if line.strip():
+                    yield parse_junction(line)
+        if partial.strip():
+            yield parse_junction(partial)
+
+def convert(input_filename, output_filename):
+    write_point_cloud(read_junctions(input_filename), output_filename)
+
+def load_junctions(filename):
+    # A PointCloud for a binary file, otherwise the text is parsed into tuples.
+    with open(filename, 'rb') as f:
+        is_binary = f.read(len(MAGIC)) == MAGIC
+    if is_binary:
+        return PointCloud(filename)
+    return list(read_junctions(filename))
+
+if __name__ == "__main__":
+    if len(sys.argv) != 3:
+        print(f"Usage: python {sys.argv[0]} <input_filename> <output_filename>")
+        sys.exit(1)
+    convert(sys.argv[1], sys.argv[2])
+    with PointCloud(sys.argv[2]) as cloud:
+        print(f"Wrote {len(cloud)} junctions to {sys.argv[2]}")
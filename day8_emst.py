@@ -0,0 +1,168 @@
+import sys, os
+from day8_part1 import parse_input, closest_pairs, UnionFind
+
+# Euclidean minimum spanning tree of the junction boxes. Connecting the closest
+# pairs one after another (Kruskal) only ever joins two circuits along an edge of
+# this tree, so the tree answers both parts of Day 8: Part 2's last connection is
+# its longest edge, and Part 1's circuits after K connections are its components
+# once the edges longer than the K-th shortest pair are left out. Edges are
+# (d2, i, j) with i < j and compared as tuples, so ties break by index and the
+# tree is always the same one Kruskal would build.
+
+LEAF_SIZE = 8 # points per k-d tree leaf
+
+def build_kd_tree(points):
+    # Returns (order, nodes). order is a permutation of the point indices, and
+    # each node is [start, end, low, high, left, right]: it holds order[start:end],
+    # low/high are the corners of their bounding box, and left/right are child
+    # node numbers (-1 for a leaf). Node 0 is the root.
+    order = list(range(len(points)))
+    nodes = []
+    pending = [(0, len(points), None, None)] # (start, end, parent, is_right)
+    while pending:
+        start, end, parent, is_right = pending.pop()
+        members = [points[i] for i in order[start:end]]
+        low = tuple(min(p[axis] for p in members) for axis in range(3))
+        high = tuple(max(p[axis] for p in members) for axis in range(3))
+        node = len(nodes)
+        nodes.append([start, end, low, high, -1, -1])
+        if parent is not None:
+            nodes[parent][5 if is_right else 4] = node
+        if end - start > LEAF_SIZE:
+            axis = max(range(3), key=lambda a: high[a] - low[a]) # split the widest side at the median
+            order[start:end] = sorted(order[start:end], key=lambda i: points[i][axis])
+            middle = (start + end) // 2
+            pending.append((middle, end, node, True))
+            pending.append((start, middle, node, False))
+    return order, nodes
+
+def box_distance(x, y, z, low, high):
+    # Squared distance from a point to the nearest point of a box.
+    dx = low[0] - x if x < low[0] else x - high[0] if x > high[0] else 0
+    dy = low[1] - y if y < low[1] else y - high[1] if y > high[1] else 0
+    dz = low[2] - z if z < low[2] else z - high[2] if z > high[2] else 0
+    return dx * dx + dy * dy + dz * dz
+
+def boruvka_mst(points):
+    # Boruvka rounds: every circuit finds its shortest edge to another circuit and
+    # all of those edges are added at once, so the number of circuits at least
+    # halves each round. The searches use the k-d tree, skipping subtrees that are
+    # all in the searching circuit or further away than the best edge it has found
+    # so far, and a point whose nearest outside neighbour is still outside doesn't
+    # search again. Returns the tree's edges, sorted.
+    n = len(points)
+    if n < 2:
+        return []
+    order, nodes = build_kd_tree(points)
+    circuits = UnionFind(n)
+    edges = []
+    nearest = [None] * n # each point's nearest (d2, i, j) into another circuit, when known
+    while circuits.count > 1:
+        circuit = [circuits.find(i) for i in range(n)]
+        # Circuit every point under a node belongs to, or -1 if they're mixed.
+        # Children come after their parent in nodes, so go backwards.
+        node_circuit = [-1] * len(nodes)
+        for node in range(len(nodes) - 1, -1, -1):
+            start, end, low, high, left, right = nodes[node]
+            if left < 0:
+                first = circuit[order[start]]
+                if all(circuit[i] == first for i in order[start:end]):
+                    node_circuit[node] = first
+            elif node_circuit[left] == node_circuit[right]:
+                node_circuit[node] = node_circuit[left]
+        best = {} # circuit -> shortest (d2, i, j) leaving it so far
+        for q in range(n):
+            c = circuit[q]
+            edge = nearest[q]
+            if edge and circuit[edge[1]] != circuit[edge[2]]:
+                # Circuits only grow, so the nearest point in another circuit
+                # last round is still the nearest one if it is still outside.
+                if c not in best or edge < best[c]:
+                    best[c] = edge
+                continue
+            x, y, z = points[q]
+            found = best.get(c)
+            nearest[q] = None
+            stack = [(0, 0)] # (distance to the node's box, node)
+            while stack:
+                reach, node = stack.pop()
+                if node_circuit[node] == c or found and reach > found[0]:
+                    continue
+                start, end, low, high, left, right = nodes[node]
+                if left < 0:
+                    for j in order[start:end]:
+                        if circuit[j] != c:
+                            x2, y2, z2 = points[j]
+                            edge = ((x2 - x)**2 + (y2 - y)**2 + (z2 - z)**2, q, j) if q < j else \
+                                   ((x2 - x)**2 + (y2 - y)**2 + (z2 - z)**2, j, q)
+                            if not found or edge < found:
+                                found = nearest[q] = edge
+                    continue
+                # Nearer child on top of the stack, so the bound tightens sooner.
+                near = (box_distance(x, y, z, nodes[left][2], nodes[left][3]), left)
+                far = (box_distance(x, y, z, nodes[right][2], nodes[right][3]), right)
+                if near > far:
+                    near, far = far, near
+                stack += [far, near]
+            # nearest[q] is only set if q's own search beat the circuit's best so far,
+            # in which case it is q's nearest point outside the circuit.
+            if found:
+                best[c] = found
+        for edge in sorted(best.values()):
+            if circuits.union(edge[1], edge[2]):
+                edges.append(edge)
+    return sorted(edges)
+
+class EuclideanMST:
+    def __init__(self, points):
+        self.points = points
+        self.edges = boruvka_mst(points)
+
+    def bottleneck_edge(self):
+        # The longest tree edge: the connection that finally makes a single circuit.
+        return self.edges[-1] if self.edges else None
+
+    def component_sizes(self, cutoff):
+        # Circuit sizes, largest first, once the `cutoff` shortest tree edges are in.
+        circuits = UnionFind(len(self.points))
+        for d2, i, j in self.edges[:cutoff]:
+            circuits.union(i, j)
+        return sorted(circuits.component_sizes(), reverse=True)
+
+    def circuit_sizes(self, connections):
+        # Circuit sizes after connecting the `connections` closest pairs (Part 1).
+        # Only the last of those pairs is needed: the tree edges up to it join
+        # exactly the same circuits.
+        pairs = closest_pairs(self.points, connections)
+        if not pairs:
+            return self.component_sizes(0)
+        cutoff = sum(1 for edge in self.edges if edge <= pairs[-1])
+        return self.component_sizes(cutoff)
+
+    def last_connection_product(self):
+        # Part 2: the X coordinates of the last two junction boxes connected, multiplied.
+        edge = self.bottleneck_edge()
+        if edge is None:
+            return None
+        d2, i, j = edge
+        return self.points[i][0] * self.points[j][0]
+
+if __name__ == "__main__":
+    # If no filename is provided, try common input filenames before failing.
+    if len(sys.argv) == 2:
+        input_filename = sys.argv[1]
+    else:
+        # prefer Gayle's input if present, otherwise Dean's input
+        if os.path.exists("day8_input_gayle.txt"):
+            input_filename = "day8_input_gayle.txt"
+        elif os.path.exists("day8_input_dean.txt"):
+            input_filename = "day8_input_dean.txt"
+        else:
+            print(f"Usage: python {sys.argv[0]} <input_filename>")
+            sys.exit(1)
+
+    junctions = parse_input(open(input_filename).read())
+    mst = EuclideanMST(junctions)
+    circuit_lengths = mst.circuit_sizes(1000)
+    print(f"Day 8 Part 1 result: {circuit_lengths[0] * circuit_lengths[1] * circuit_lengths[2]}")
+    print(f"Day 8 Part 2 result: {mst.last_connection_product()}")
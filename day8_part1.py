@@ -1,17 +1,26 @@
-import sys, os, heapq
+import sys, os, heapq, math
+from array import array
+
+try:
+    import numpy as np
+except ImportError: # without numpy, closest_pairs always uses the grid
+    np = None
 
 DEBUG = False
+VECTORIZE_POINTS = 50000 # up to this many points, closest_pairs may brute-force all pairs with numpy
+VECTORIZE_PAIRS_PER_RESULT = 2000 # ...if there are at most this many pairs per pair asked for
+TILE = 1024 # rows and columns per block of the distance matrix in closest_pair_indices_vectorized
 
-def parse_input(input_text):
+def parse_junction(line):
     try:
-        junctions = []
-        for line in input_text.splitlines():
-            x, y, z = line.strip().split(',')
-            x, y, z = int(x), int(y), int(z)
-            junctions.append((x, y, z))
-        return junctions
+        x, y, z = line.strip().split(',')
+        return int(x), int(y), int(z)
     except ValueError:
-        print(f"Error parsing line: {line}")
+        raise ValueError(f"Error parsing line: {line!r}") from None
+
+def parse_input(input_text):
+    # Blank lines are skipped; anything else that isn't x,y,z raises ValueError.
+    return [parse_junction(line) for line in input_text.splitlines() if line.strip()]
 
 def calculate_distance(j1, j2):
     # Calculate straight-line distance between two points in 3D space.
@@ -19,108 +28,242 @@ def calculate_distance(j1, j2):
     x2, y2, z2 = j2
     return ((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2) ** 0.5
 
+def grid_cell_size(points, limit):
+    # Cell size for the spatial grid: about the distance within which a uniform
+    # cloud of len(points) points has `limit` pairs, so the shortest pairs sit in
+    # the same or neighbouring cells.
+    n = len(points)
+    volume = 1
+    for axis in range(3):
+        coordinates = [p[axis] for p in points]
+        volume *= max(max(coordinates) - min(coordinates), 1)
+    return max(1, math.ceil((3 * limit * volume / (2 * math.pi * n * n)) ** (1 / 3)))
+
+def grid_cells(points, h):
+    # Point indices bucketed by grid cell, and the largest cell coordinate (cells
+    # are counted from the lowest corner of the cloud, so they start at 0).
+    low = [min(p[axis] for p in points) for axis in range(3)]
+    cells = {}
+    for i, (x, y, z) in enumerate(points):
+        cells.setdefault(((x - low[0]) // h, (y - low[1]) // h, (z - low[2]) // h), []).append(i)
+    span = max(max(cell[axis] for cell in cells) for axis in range(3))
+    return cells, span
+
+def shell_offsets(r):
+    # Cell offsets at Chebyshev distance exactly r, keeping only one of each
+    # +/- pair so each pair of cells is visited once.
+    return [(dx, dy, dz)
+            for dx in range(0, r + 1)
+            for dy in range(-r, r + 1)
+            for dz in range(-r, r + 1)
+            if max(abs(dx), abs(dy), abs(dz)) == r and (dx, dy, dz) > (0, 0, 0)]
+
+def closest_pair_indices(points, limit=1000, cell_size=None):
+    # The `limit` shortest pairs as (squared distance, i, j) with i < j, shortest
+    # first (ties by index). Points are bucketed into a uniform grid of cubes and
+    # cell pairs are visited in shells of growing Chebyshev distance r. Two points
+    # whose cells are more than r apart differ by more than r * cell_size along
+    # some axis, so once the heap is full and its longest pair is no longer than
+    # that, nothing left can beat it. If three shells aren't enough the cells
+    # were too small for this cloud, so it starts again with cells twice the size.
+    n = len(points)
+    limit = min(limit, n * (n - 1) // 2)
+    if limit <= 0:
+        return []
+    h = cell_size or grid_cell_size(points, limit)
+    while True:
+        cells, span = grid_cells(points, h)
+        heap = [] # (-d2, -i, -j), so the longest pair kept is at the front
+        settled = True
+        for r in range(span + 1):
+            offsets = shell_offsets(r)
+            for (cx, cy, cz), members in cells.items():
+                if r == 0:
+                    neighbours = [(members, True)]
+                else:
+                    neighbours = [(cells[cell], False) for cell in
+                                  ((cx + dx, cy + dy, cz + dz) for dx, dy, dz in offsets) if cell in cells]
+                for others, same_cell in neighbours:
+                    for a, i in enumerate(members):
+                        x1, y1, z1 = points[i]
+                        for j in (others[a + 1:] if same_cell else others):
+                            x2, y2, z2 = points[j]
+                            d2 = (x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2
+                            key = (-d2, -i, -j) if i < j else (-d2, -j, -i)
+                            if len(heap) < limit:
+                                heapq.heappush(heap, key)
+                            elif key > heap[0]:
+                                heapq.heapreplace(heap, key)
+            if len(heap) == limit and -heap[0][0] <= (r * h) ** 2:
+                break
+            if r == 2 and r < span:
+                settled = False
+                break
+        if settled:
+            break
+        h *= 2 # cells too small; try again with bigger ones
+    return sorted((-d2, -i, -j) for d2, i, j in heap)
+
+def closest_pair_indices_vectorized(points, limit=1000, tile=TILE):
+    # Same result as closest_pair_indices, by brute force over the upper triangle
+    # of the distance matrix one tile x tile block at a time, so memory stays at a
+    # few blocks however many points there are. A block only hands on the pairs
+    # that could still make the cut: no longer than the limit-th shortest so far,
+    # and only the `limit` shortest of those (argpartition), keeping ties at the
+    # cut so the final (d2, i, j) order is exact.
+    coords = np.asarray(points, dtype=np.int64).reshape(-1, 3)
+    n = len(coords)
+    limit = min(limit, n * (n - 1) // 2)
+    if limit <= 0:
+        return []
+    no_pair = np.iinfo(np.int64).max
+    below_diagonal = np.tri(min(tile, n), dtype=bool) # j <= i inside a block on the diagonal
+    found_d2, found_i, found_j = [], [], []
+    found, bound = 0, no_pair - 1 # bound: limit-th shortest squared distance found so far
+    for a0 in range(0, n, tile):
+        a = coords[a0:a0 + tile]
+        for b0 in range(a0, n, tile):
+            b = coords[b0:b0 + tile]
+            d2 = (a[:, 0, None] - b[None, :, 0]) ** 2
+            d2 += (a[:, 1, None] - b[None, :, 1]) ** 2
+            d2 += (a[:, 2, None] - b[None, :, 2]) ** 2
+            if b0 == a0:
+                d2[below_diagonal[:len(a), :len(b)]] = no_pair
+            flat = d2.ravel()
+            candidates = np.flatnonzero(flat <= bound)
+            values = flat[candidates]
+            if values.size > limit:
+                shortest = values <= np.partition(values, limit - 1)[limit - 1]
+                candidates, values = candidates[shortest], values[shortest]
+            found_d2.append(values)
+            found_i.append(candidates // len(b) + a0)
+            found_j.append(candidates % len(b) + b0)
+            found += values.size
+            if found >= 2 * limit:
+                # Squeeze down to the shortest limit pairs (plus ties) and tighten the bound.
+                values = np.concatenate(found_d2)
+                bound = np.partition(values, limit - 1)[limit - 1]
+                shortest = values <= bound
+                found_d2 = [values[shortest]]
+                found_i = [np.concatenate(found_i)[shortest]]
+                found_j = [np.concatenate(found_j)[shortest]]
+                found = found_d2[0].size
+    d2, i, j = np.concatenate(found_d2), np.concatenate(found_i), np.concatenate(found_j)
+    order = np.lexsort((j, i, d2))[:limit]
+    return list(zip(d2[order].tolist(), i[order].tolist(), j[order].tolist()))
+
+def closest_pairs(points, limit=1000):
+    # The `limit` shortest pairs as sorted (d2, i, j). Brute force costs the same
+    # for any limit while the grid's cost grows with it, so all pairs with numpy
+    # when there aren't too many of them for the number asked for (and the squares
+    # fit in int64), the grid otherwise.
+    n = len(points)
+    if np is not None and 0 < n <= VECTORIZE_POINTS and n * (n - 1) // 2 <= VECTORIZE_PAIRS_PER_RESULT * limit:
+        extent = max(max(p[axis] for p in points) - min(p[axis] for p in points) for axis in range(3))
+        if 3 * extent ** 2 < 2**63:
+            return closest_pair_indices_vectorized(points, limit)
+    return closest_pair_indices(points, limit)
+
 def closest_junctions(junctions, limit=1000):
-    points = []
-    seen = set()
-    for j1 in junctions:
-        for j2 in junctions:
-            if j1 != j2: 
-                # Also need to skip if already connected.
-                pair = tuple(sorted((j1, j2)))
-                if pair in seen:
-                    continue
-                seen.add(pair)            
-
-                d = calculate_distance(j1, j2)
-                heapq.heappush(points, (-d, (j1, j2))) # Use negative distance so the largest one is always at the front.
-                if len(points) > limit:
-                    heapq.heappop(points)  # Remove the farthest set of points.
-
-    sorted_points = sorted([(-d, pts) for d, pts in points]) # Sort the list by distance (smallest first).
+    sorted_points = closest_pairs(junctions, limit)
     if DEBUG:
         print(f"sorted_points:")
-        for p in sorted_points:
-            print(p)
-    
-    return [pts for d, pts in sorted_points] # Return just return the points, not the distance.
+        for d2, i, j in sorted_points:
+            print((d2 ** 0.5, (junctions[i], junctions[j])))
+
+    return [(junctions[i], junctions[j]) for d2, i, j in sorted_points] # Return just the points, not the distance.
+
+class UnionFind:
+    # Disjoint sets over 0..size-1, with parents and set sizes in flat int arrays.
+    # union hangs the smaller set under the larger, and find halves the path as it
+    # goes (each node it passes is pointed at its grandparent), so trees stay
+    # shallow and find never recurses.
+    def __init__(self, size):
+        self.parent = array('i', range(size))
+        self.size = array('i', [1]) * size
+        self.count = size
+    def find(self, x):
+        parent = self.parent
+        while parent[x] != x:
+            parent[x] = parent[parent[x]]
+            x = parent[x]
+        return x
+    def union(self, x, y):
+        x, y = self.find(x), self.find(y)
+        if x == y:
+            return False
+        if self.size[x] < self.size[y]:
+            x, y = y, x
+        self.parent[y] = x
+        self.size[x] += self.size[y]
+        self.count -= 1
+        return True
+    def component_size(self, x):
+        return self.size[self.find(x)]
+    def component_sizes(self):
+        # Size of every set, singletons included, in order of their root index.
+        return [self.size[x] for x in range(len(self.parent)) if self.parent[x] == x]
 
 def connect_circuits(closest_junctions, full_junctions):
-    circuits = []
+    index = {j: i for i, j in enumerate(full_junctions)}
+    circuits = UnionFind(len(full_junctions))
     for j1, j2 in closest_junctions:
-        # Check if j1 and j2 are already connected in any circuit.
-        circuit1 = None
-        circuit2 = None
-        for circuit in circuits:
-            if j1 in circuit:
-                circuit1 = circuit
-            if j2 in circuit:
-                circuit2 = circuit
-
-        if DEBUG:
-            print(f"Connecting {j1} <-> {j2}")
-            print(f"  circuit1: {circuit1}")
-            print(f"  circuit2: {circuit2}")
-                
-        if circuit1 is None and circuit2 is None:
-            # Neither junction box is in a circuit, create a new one.
-            print(f"  Creating new circuit for {j1} and {j2}") if DEBUG else None
-            circuits.append(set([j1, j2]))
-        elif circuit1 is not None and circuit2 is None:
-            # Only j1 is in a circuit, add j2 to it.
-            print(f"  Adding {j2} to existing circuit for {j1}") if DEBUG else None
-            circuit1.add(j2)
-        elif circuit1 is None and circuit2 is not None:
-            # Only j2 is in a circuit, add j1 to it.
-            print(f"  Adding {j1} to existing circuit for {j2}") if DEBUG else None
-            circuit2.add(j1)
-        elif circuit1 is not circuit2:
-            # Both junction boxes are in different circuits, merge them.
-            print(f"  Merging circuits for {j1} and {j2}") if DEBUG else None
-            circuit1.update(circuit2)
-            circuits.remove(circuit2)
+        if circuits.union(index[j1], index[j2]):
+            print(f"  Connected {j1} <-> {j2}, circuit size now {circuits.component_size(index[j1])}") if DEBUG else None
         else:
             # If both junction boxes are already in the same circuit, do nothing.
             print(f"  {j1} and {j2} are already connected in the same circuit.") if DEBUG else None
-        if DEBUG:
-            print(f"  New circuits:")
-            for c in circuits:
-                print(f"    {c}")
 
-    # Find all junctions that were not in any closest pair
-    paired_junctions = set()
-    for j1, j2 in closest_junctions:
-        paired_junctions.add(j1)
-        paired_junctions.add(j2)
-    singletons = set(full_junctions) - paired_junctions
-    for singleton in singletons:
-        print(f"  Adding singleton junction box {singleton} as its own circuit.") if DEBUG else None
-        circuits.append(set([singleton]))
-
-    if DEBUG:
-        print(f"[connect_circuits] Final circuits:")
-        for c in circuits:
-            print(f"    {c}")
-
-    circuit_lengths = sorted([len(circuit) for circuit in circuits], reverse=True) # sort with largest first
+    # Junctions that were not in any closest pair are circuits of their own.
+    circuit_lengths = sorted(circuits.component_sizes(), reverse=True) # sort with largest first
     if DEBUG:
         print(f"[connect_circuits] After sorting: {circuit_lengths}")
     
     return circuit_lengths
 
-def calculate_result(junctions):
+def circuit_size_products(size, pairs):
+    # Answers Part 1 for every number of connections in one pass over the sorted
+    # pairs: products[k] is the product of the three largest circuit sizes after
+    # the first k pairs are connected (of all of them, if there are fewer than
+    # three circuits left). The largest circuits come off a max-heap of
+    # (-size, root) entries. An entry goes stale when its circuit is merged into
+    # another; stale entries are dropped when they reach the top, so each
+    # connection costs O(log n).
+    circuits = UnionFind(size)
+    largest = [(-1, i) for i in range(size)] # already a heap
+    products = [1] # every circuit starts with one junction box
+    product = 1
+    for d2, i, j in pairs:
+        if circuits.union(i, j):
+            root = circuits.find(i)
+            heapq.heappush(largest, (-circuits.size[root], root))
+            top = []
+            while len(top) < 3 and largest:
+                entry = heapq.heappop(largest)
+                if circuits.parent[entry[1]] == entry[1] and circuits.size[entry[1]] == -entry[0]:
+                    top.append(entry)
+            for entry in top:
+                heapq.heappush(largest, entry)
+            product = 1
+            for entry in top:
+                product *= -entry[0]
+        products.append(product)
+    return products
+
+def calculate_result(junctions, connections=1000):
     # Get list of closest junction box pairs.
-    closest = closest_junctions(junctions)
+    closest = closest_pairs(junctions, connections)
     if DEBUG:
         print(f"[calculate_result] Closest junction box pairs (total {len(closest)}):")
-        for j1, j2 in closest:
-            print(f"  {j1} <-> {j2}")
+        for d2, i, j in closest:
+            print(f"  {junctions[i]} <-> {junctions[j]}")
 
     # Connect together the 1000 pairs of junction boxes which are closest together.
     # Afterward, what do you get if you multiply together the sizes of the three largest circuits?
-    circuit_lengths = connect_circuits(closest, junctions)
+    products = circuit_size_products(len(junctions), closest)
     if DEBUG:
-        print(f"[calculate_result] circuits: {circuit_lengths}")
-    return circuit_lengths[0] * circuit_lengths[1] * circuit_lengths[2]
+        print(f"[calculate_result] products after each connection: {products}")
+    return products[-1]
 
 if __name__ == "__main__":
     # If no filename is provided, try common input filenames before failing.
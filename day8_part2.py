@@ -1,62 +1,119 @@
-import sys, os
+import sys, os, heapq
+from day8_part1 import parse_input, calculate_distance, closest_pairs, UnionFind, grid_cells, shell_offsets, np
 
-def parse_input(input_text):
-    try:
-        junctions = []
-        for line in input_text.splitlines():
-            x, y, z = line.strip().split(',')
-            x, y, z = int(x), int(y), int(z)
-            junctions.append((x, y, z))
-        return junctions
-    except ValueError:
-        print(f"Error parsing line: {line}")
+STREAM_POINTS = 20000 # above this many points (or without numpy), find_last_connection streams pairs from lazy_pairs
 
-def calculate_distance(j1, j2):
-    x1, y1, z1 = j1
-    x2, y2, z2 = j2
-    return ((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2) ** 0.5
+def stream_cell_size(points):
+    # Grid cells holding about two points each on a uniform cloud.
+    volume = 1
+    for axis in range(3):
+        coordinates = [p[axis] for p in points]
+        volume *= max(max(coordinates) - min(coordinates), 1)
+    return max(1, round((2 * volume / len(points)) ** (1 / 3)))
 
-class UnionFind:
-    def __init__(self, elements):
-        self.parent = {e: e for e in elements}
-        self.count = len(elements)
-    def find(self, x):
-        if self.parent[x] != x:
-            self.parent[x] = self.find(self.parent[x])
-        return self.parent[x]
-    def union(self, x, y):
-        px, py = self.find(x), self.find(y)
-        if px == py:
-            return False
-        self.parent[py] = px
-        self.count -= 1
-        return True
+def lazy_pairs(points, cell_size=None):
+    # Every pair as (d2, i, j) with i < j, in sorted order, without building the
+    # list. Each point i has its own stream of partners j > i, filled one grid
+    # shell at a time: once shells 0..r around its cell are in, anything further
+    # out is more than r * h away, so its buffered partners closer than that are
+    # settled. A global heap holds each stream's next settled pair, or the lower
+    # bound for its next shell if nothing is settled yet, so a stream only grows
+    # when it is the next one that could hold the shortest remaining pair.
+    if len(points) < 2:
+        return
+    h = cell_size or stream_cell_size(points)
+    cells, span = grid_cells(points, h)
+    cell_of = [None] * len(points)
+    for cell, members in cells.items():
+        for i in members:
+            cell_of[i] = cell
+    shells = {} # r -> offsets at Chebyshev distance r, in both directions
+    buffers = [[] for _ in points] # per-point heap of (d2, j) found but not yet settled
+    rings = [-1] * len(points) # last shell added to each stream
+    far = [None] * len(points) # occupied cells not yet added, by ring, once a stream's shells get too big
 
-def find_last_connection(junctions):
-    # Build all unique pairs and their distances
-    pairs = []
-    seen = set()
-    for i, j1 in enumerate(junctions):
-        for j2 in junctions[i+1:]:
-            pair = tuple(sorted((j1, j2)))
-            if pair in seen:
-                continue
-            seen.add(pair)
-            d = calculate_distance(j1, j2)
-            pairs.append((d, j1, j2))
-    pairs.sort()  # shortest distance first
+    def next_key(i):
+        # (d2, i, j) for a settled pair, (bound, i, -1) when the next shell is needed,
+        # or None when the stream is finished.
+        buffer, r = buffers[i], rings[i]
+        bound = (r * h + 1) ** 2 # every point outside shells 0..r is at least this far
+        if buffer and (buffer[0][0] < bound or r >= span):
+            return (buffer[0][0], i, buffer[0][1])
+        if r >= span:
+            return None
+        return (bound if r >= 0 else 0, i, -1)
+
+    def grow(i):
+        r = rings[i] + 1
+        cx, cy, cz = cell_of[i]
+        if far[i] is None and (2 * r + 1) ** 3 - (2 * r - 1) ** 3 > len(cells):
+            # The shell has more cells than are occupied in the whole grid, so from
+            # here on go through the occupied cells by ring instead, which also
+            # skips the empty rings.
+            far[i] = sorted(((max(abs(x - cx), abs(y - cy), abs(z - cz)), (x, y, z)) for x, y, z in cells
+                             if max(abs(x - cx), abs(y - cy), abs(z - cz)) >= r), reverse=True)
+        if far[i] is not None:
+            if not far[i]:
+                rings[i] = span
+                return
+            r = far[i][-1][0]
+            ring_cells = []
+            while far[i] and far[i][-1][0] == r:
+                ring_cells.append(far[i].pop()[1])
+        else:
+            if r not in shells:
+                shells[r] = [(0, 0, 0)] if r == 0 else shell_offsets(r) + [(-dx, -dy, -dz) for dx, dy, dz in shell_offsets(r)]
+            ring_cells = [(cx + dx, cy + dy, cz + dz) for dx, dy, dz in shells[r]]
+        rings[i] = r
+        x1, y1, z1 = points[i]
+        for cell in ring_cells:
+            for j in cells.get(cell, ()):
+                if j > i:
+                    x2, y2, z2 = points[j]
+                    heapq.heappush(buffers[i], ((x2 - x1)**2 + (y2 - y1)**2 + (z2 - z1)**2, j))
+
+    streams = [(0, i, -1) for i in range(len(points))] # already a heap
+    while streams:
+        d2, i, j = streams[0]
+        if j < 0:
+            grow(i)
+        else:
+            heapq.heappop(buffers[i])
+            yield d2, i, j
+        key = next_key(i)
+        if key is None:
+            heapq.heappop(streams)
+        else:
+            heapq.heapreplace(streams, key)
+
+def last_connection(size, pairs):
+    # Kruskal over sorted (d2, i, j) pairs: the pair that joins the last two
+    # circuits as (i, j), or None if the pairs run out first.
+    uf = UnionFind(size)
+    for d2, i, j in pairs:
+        if uf.union(i, j) and uf.count == 1:
+            return i, j
+    return None
 
-    uf = UnionFind(junctions)
-    last_pair = None
-    for d, j1, j2 in pairs:
-        if uf.union(j1, j2):
-            last_pair = (j1, j2)
-            if uf.count == 1:
+def find_last_connection(junctions):
+    n = len(junctions)
+    if np is not None and n <= STREAM_POINTS:
+        # The joining pair is well down the sorted list of all pairs but nowhere
+        # near the end of it (around n log n for a random cloud), so take that many
+        # shortest pairs in one batch and go back for four times as many if they
+        # don't join everything.
+        limit = n * max(1, n.bit_length())
+        while True:
+            pairs = closest_pairs(junctions, limit)
+            last_pair = last_connection(n, pairs)
+            if last_pair or len(pairs) < limit: # joined up, or there are no more pairs
                 break
+            limit *= 4
+    else:
+        last_pair = last_connection(n, lazy_pairs(junctions))
     if last_pair:
-        x1, _, _ = last_pair[0]
-        x2, _, _ = last_pair[1]
-        return x1 * x2
+        i, j = last_pair
+        return junctions[i][0] * junctions[j][0]
     return None
 
 if __name__ == "__main__":
@@ -78,3 +78,20 @@ def test_count_times_dial_is_at_zero():
 		assert 3 == result
 	finally: 
 		os.remove(temp_filename)
+
+def test_count_times_dial_is_at_zero_parallel(): 
+	# Enough lines that the file is split into several chunks per process.
+	test_content = "L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\nR1000\nL250\n" * 50
+
+	with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp: 
+		tmp.write(test_content)
+		tmp.flush()
+		temp_filename = tmp.name
+
+	try:
+		serial = Day1Part1.count_times_dial_is_at_zero(temp_filename)
+		assert serial == 12
+		assert serial == Day1Part1.count_times_dial_is_at_zero(temp_filename, processes=1)
+		assert serial == Day1Part1.count_times_dial_is_at_zero(temp_filename, processes=2)
+	finally: 
+		os.remove(temp_filename)
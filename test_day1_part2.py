@@ -91,3 +91,48 @@ def test_count_times_dial_crosses_zero_with_R1000():
         assert 10 == result
     finally:
         os.remove(temp_filename)
+
+def test_parse_rotations_from_iterable():
+    assert [-68, -30, 48, 0] == list(Day1Part2.parse_rotations(["L68", "L30 R48", "R0"]))
+
+def test_parse_rotations_token_split_across_chunks():
+    test_content = "L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\n"
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(test_content)
+        tmp.flush()  # Ensure data is written
+        temp_filename = tmp.name
+
+    try:
+        deltas = list(Day1Part2.parse_rotations(temp_filename, chunk_size=4))
+        assert [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82] == deltas
+    finally:
+        os.remove(temp_filename)
+
+def test_count_zero_hits():
+    deltas = [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82]
+    assert (3, 6) == Day1Part2.count_zero_hits(deltas)
+
+def test_count_zero_hits_vectorized():
+    pytest.importorskip("numpy")
+    deltas = [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82, 1000, -1000, 0, -50, -100, 250]
+    assert Day1Part2.count_zero_hits(deltas) == Day1Part2.count_zero_hits_vectorized(deltas)
+
+def test_summarize_rotations_matches_every_start_position():
+    deltas = [-68, -30, 48, -5, 60, -55, -1, -99, 14, -82, 1000, -1000, 0, -50, -100, 250]
+    summary = Day1Part2.summarize_rotations(deltas)
+    for start in range(100):
+        assert Day1Part2.count_zero_hits(deltas, start) == Day1Part2.combine_summaries([summary], start)
+
+def test_count_zero_hits_parallel():
+    test_content = "L68\nL30\nR48\nL5\nR60\nL55\nL1\nL99\nR14\nL82\nR1000\nL250\n" * 50
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(test_content)
+        tmp.flush()  # Ensure data is written
+        temp_filename = tmp.name
+
+    try:
+        serial = Day1Part2.count_zero_hits(Day1Part2.parse_rotations(temp_filename))
+        assert serial == Day1Part2.count_zero_hits_parallel(temp_filename, processes=2)
+        assert serial[1] == Day1Part2.count_times_dial_crosses_zero(temp_filename, processes=2)
+    finally:
+        os.remove(temp_filename)
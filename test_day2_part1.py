@@ -54,3 +54,24 @@ def test_824824821_824824827():
 def test_2121212118_2121212124():
     assert [] == Day2Part1.invalid_ids(2121212118, 2121212124)
 
+def test_sum_of_range_matches_invalid_ids():
+    for start, end in [(11, 22), (95, 115), (998, 1012), (1, 100000), (2894097247, 2894150301)]:
+        assert sum(Day2Part1.invalid_ids(start, end)) == Day2Part1.sum_of_range(start, end)
+
+def test_sum_of_range_wide():
+    # Every 12-digit ID that is a 6-digit block repeated twice: blocks 100000..999999 times 1000001.
+    assert Day2Part1.sum_of_range(10**11, 10**12 - 1) == 1000001 * (100000 + 999999) * 900000 // 2
+
+def test_full_input():
+    input = "11-22,95-115,998-1012,1188511880-1188511890,222220-222224,1698522-1698528,446443-446449,38593856-38593862,565653-565659,824824821-824824827,2121212118-2121212124"
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(input)
+        tmp.flush()
+        tmp_name = tmp.name
+    try:
+        assert 1227775554 == Day2Part1.sum_of_invalid_ids(tmp_name)
+    finally:
+        try:
+            os.unlink(tmp_name)
+        except Exception:
+            pass
@@ -59,6 +59,39 @@ def test_824824825():
 def test_824825824():
     assert False == Day2Part2.invalid_id(824825824)
 
+def test_invalid_ids_counts_each_id_once():
+    # 222222 repeats with blocks of 1, 2 and 3 digits
+    assert [222222] == Day2Part2.invalid_ids(222220, 222224)
+    assert [99, 111] == Day2Part2.invalid_ids(95, 115)
+
+def test_sum_of_range_matches_invalid_id():
+    for start, end in [(95, 115), (1, 100000), (2121212118, 2121212124), (999990, 1010110)]:
+        expected = sum(n for n in range(start, end + 1) if Day2Part2.invalid_id(n))
+        assert expected == Day2Part2.sum_of_range(start, end)
+
+def test_classify_ids():
+    ids = [11, 111, 1010, 1188511885, 222222, 565656, 824824824, 1, 110, 824824825, 824825824]
+    expected = [True] * 7 + [False] * 4
+    assert expected == Day2Part2.classify_ids(ids)
+
+def test_classify_ids_numpy():
+    np = pytest.importorskip("numpy")
+    ids = np.arange(1, 200000)
+    expected = [Day2Part2.invalid_id(int(n)) for n in ids]
+    assert expected == Day2Part2.classify_ids(ids).tolist()
+
+def test_classify_ids_numpy_19_digits():
+    np = pytest.importorskip("numpy")
+    # Past 10**18 the whole-array check would overflow int64.
+    ids = np.array([1111111111111111111, 2222222222222222222, 1111111111111111112, 999999999999999999, 2**63 - 1])
+    expected = [Day2Part2.invalid_id(int(n)) for n in ids]
+    assert expected == [True, True, False, True, False]
+    assert expected == Day2Part2.classify_ids(ids).tolist()
+
+def test_scan_invalid_ids_matches_invalid_ids():
+    for start, end in [(95, 115), (998, 1012), (1, 100000), (2121212118, 2121212124)]:
+        assert Day2Part2.invalid_ids(start, end) == Day2Part2.scan_invalid_ids(start, end)
+
 def test_full_input():
     input = "11-22,95-115,998-1012,1188511880-1188511890,222220-222224,1698522-1698528,446443-446449,38593856-38593862,565653-565659,824824821-824824827,2121212118-2121212124"
     # On Windows the default NamedTemporaryFile can't be reopened by name
@@ -75,4 +108,22 @@ def test_full_input():
             os.unlink(tmp_name)
         except Exception:
             pass
-    
\ No newline at end of file
+    
+def test_shard_ranges():
+    assert [(1, 4), (5, 8), (9, 10), (20, 20)] == Day2Part2.shard_ranges([("1", "10"), ("20", "20")], 3)
+
+def test_parallel_sum_of_invalid_ids():
+    input = "11-22,95-115,998-1012,1188511880-1188511890,222220-222224,1698522-1698528,446443-446449,38593856-38593862,565653-565659,824824821-824824827,2121212118-2121212124,1-100000"
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(input)
+        tmp.flush()
+        tmp_name = tmp.name
+    try:
+        total, shards = Day2Part2.parallel_sum_of_invalid_ids(tmp_name, workers=2)
+        assert Day2Part2.sum_of_invalid_ids(tmp_name) == total
+        assert sum(partial for _, _, partial, _ in shards) == total
+    finally:
+        try:
+            os.unlink(tmp_name)
+        except Exception:
+            pass
@@ -51,3 +51,12 @@ def test_total_output_joltage():
             os.unlink(tmp_name)
         except Exception:
             pass
+
+def test_select_batteries_with_k():
+    assert list("987654321111") == Day3Part1.select_batteries("987654321111111", 12)
+    assert 434234234278 == Day3Part1.max_joltage("234234234234278", 12)
+
+def test_select_batteries_long_bank():
+    bank = "1" * 1_000_000 + "9" + "2" * 1_000_000 + "8"
+    assert 98 == Day3Part1.max_joltage(bank)
+    assert int("9" + "2" * 10 + "8") == Day3Part1.max_joltage(bank, 12)
@@ -53,3 +53,19 @@ def test_total_output_joltage():
             os.unlink(tmp_name)
         except Exception:
             pass
+
+def test_total_output_joltage_uneven_and_even_banks():
+    even = "987654321111111\n811111111111119\n234234234234278\n818181911112111\n"
+    uneven = even + "1222222312332225132221222322223222212123112122221122321222132212122312222221212112222322211112122222\n"
+    for input, expected in [(even, 3121910778619), (uneven, 3121910778619 + 533333333222)]:
+        with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+            tmp.write(input)
+            tmp.flush()
+            tmp_name = tmp.name
+        try:
+            assert Day3Part2.total_output_joltage(tmp_name) == expected
+        finally:
+            try:
+                os.unlink(tmp_name)
+            except Exception:
+                pass
@@ -82,3 +82,12 @@ def test_accessible_rolls():
             os.unlink(tmp_name)
         except Exception:
             pass
+
+def test_accessible_rolls_matches_roll_is_accessible():
+    expected = [(x, y) for y in range(len(lines)) for x in range(len(lines[y])) if Day4Part1.roll_is_accessible(x, y, lines)]
+    assert Day4Part1.accessible_rolls(lines) == expected
+    assert Day4Part1.count_of_accessible_rolls(lines) == 13
+
+def test_accessible_rolls_do_not_wrap_between_rows():
+    # Rolls at the end of one row and the start of the next aren't neighbours.
+    assert Day4Part1.accessible_rolls(['.@@', '@@.', '.@@']) == [(1, 0), (2, 0), (0, 1), (1, 2), (2, 2)]
@@ -1,4 +1,5 @@
 import pytest, tempfile, sys, os
+from day4_part1 import Day4Part1
 from day4_part2 import Day4Part2
 
 # Once a roll of paper can be accessed by a forklift, it can be removed. Once a roll of paper is removed, the forklifts might be able to access more rolls of paper, which they might also be able to remove. How many total rolls of paper could the Elves remove if they keep repeating this process?
@@ -153,3 +154,23 @@ def test_accessible_rolls():
             os.unlink(tmp_name)
         except Exception:
             pass
+
+def test_peel_rolls_per_round():
+    lines = [
+        '..@@.@@@@.',
+        '@@@.@.@.@@',
+        '@@@@@.@.@@',
+        '@.@@@@..@.',
+        '@@.@@@@.@@',
+        '.@@@@@@@.@',
+        '.@.@.@.@@@',
+        '@.@@@.@@@@',
+        '.@@@@@@@@.',
+        '@.@.@@@.@.'
+    ]
+    removal_order, rolls_per_round = Day4Part2.peel_rolls(lines)
+    assert rolls_per_round == [13, 12, 7, 5, 2, 1, 1, 1, 1]
+    assert len(removal_order) == 43
+    # The first round is the 13 rolls part 1 finds, the last is the one at (3, 3).
+    assert removal_order[:13] == Day4Part1.accessible_rolls(lines)
+    assert removal_order[-1] == (3, 3)
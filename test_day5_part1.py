@@ -51,3 +51,20 @@ def test_parse_input():
 def test_fresh_ingredient_count():
     ranges, ids = Day5Part1.parse_input(input)
     assert Day5Part1.fresh_ingredient_count(ranges, ids) == 3
+
+def test_read_ranges_and_ids():
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(input)
+        tmp.flush()
+        tmp_name = tmp.name
+    try:
+        with open(tmp_name) as f:
+            starts, ends = Day5Part1.read_ranges(f)
+            assert list(zip(starts, ends)) == [(3, 5), (10, 14), (16, 20), (12, 18)]
+            assert list(Day5Part1.read_ids(f)) == [1, 5, 8, 11, 17, 32]
+        assert Day5Part1.fresh_ingredient_count_from_file(tmp_name) == 3
+    finally:
+        try:
+            os.unlink(tmp_name)
+        except Exception:
+            pass
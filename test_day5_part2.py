@@ -1,6 +1,6 @@
 import pytest, tempfile, sys, os
 from day5_part1 import Day5Part1
-from day5_part2 import Day5Part2
+from day5_part2 import Day5Part2, IntervalSet
 
 # The Elves in the kitchen explain the situation: because of their complicated new inventory management system, they can't figure out which of their ingredients are fresh and which are spoiled. When you ask how it works, they give you a copy of their database (your puzzle input).
 
@@ -49,3 +49,52 @@ def test_fresh_ingredient_count():
     result = Day5Part2.fresh_ingredient_id_count(ranges, ids)
     print(f"Day 5 Part 2 result: {result}")
 
+
+def test_is_fresh():
+    ranges, ids = Day5Part1.parse_input(input_text)
+    index = Day5Part2.build_index(ranges)
+    assert list(index[0]) == [3, 10]
+    assert list(index[1]) == [5, 20]
+    assert [Day5Part2.is_fresh(index, id) for id in ids] == [False, True, False, True, True, False]
+    assert Day5Part2.count_fresh(index, ids) == 3
+
+def test_count_fresh_vectorized():
+    np = pytest.importorskip("numpy")
+    ranges, ids = Day5Part1.parse_input(input_text)
+    index = Day5Part2.build_index(ranges)
+    all_ids = np.arange(0, 40)
+    assert Day5Part2.count_fresh_vectorized(index, all_ids) == Day5Part2.count_fresh(index, all_ids.tolist()) == 14
+    assert Day5Part2.count_fresh_vectorized(Day5Part2.build_index([]), all_ids) == 0
+
+def test_merge_ranges_external():
+    ranges, ids = Day5Part1.parse_input(input_text)
+    ranges += [[30, 31], [1, 2], [21, 25], [26, 26], [0, 1]]
+    expected = Day5Part2.merge_ranges(ranges)
+    read_block = Day5Part2.READ_BLOCK
+    Day5Part2.READ_BLOCK = 2 # make the spilled runs come back in several blocks
+    try:
+        for run_size in [1, 2, 3, 100]:
+            assert list(Day5Part2.merge_ranges_external(iter(ranges), run_size)) == expected
+            assert Day5Part2.fresh_ingredient_id_count(iter(ranges), ids, run_size) == Day5Part2.fresh_ingredient_id_count(ranges, ids)
+    finally:
+        Day5Part2.READ_BLOCK = read_block
+
+def test_interval_set():
+    ranges, ids = Day5Part1.parse_input(input_text)
+    fresh = IntervalSet(ranges)
+    assert list(fresh) == [(3, 5), (10, 20)]
+    assert fresh.count == Day5Part2.fresh_ingredient_id_count(ranges, ids) == 14
+    assert [id in fresh for id in ids] == [False, True, False, True, True, False]
+
+    fresh.add(6, 9) # joins both ranges
+    assert list(fresh) == [(3, 20)]
+    assert fresh.count == 18
+
+    fresh.remove(8, 11) # splits them again
+    assert list(fresh) == [(3, 7), (12, 20)]
+    assert fresh.count == 14
+    assert 8 not in fresh and 12 in fresh
+
+    fresh.remove(0, 100)
+    assert list(fresh) == []
+    assert fresh.count == 0
@@ -52,3 +52,10 @@ def test_solve_problem3():
 def test_total_result():
     problems = Day6Part1.parse_input(input_text)
     assert Day6Part1.total_result(problems) == 4277556
+
+def test_total_result_bulk():
+    # Products past int64 stay exact, and the bulk reduction matches solving one at a time.
+    problems = [[10**12, 10**12, '*'], [1, 2, 3, '+'], [4, '*'], [5, '+']]
+    assert Day6Part1.total_result(problems) == 10**24 + 6 + 4 + 5
+    assert Day6Part1.total_result(problems) == sum(Day6Part1.solve_problem(problem) for problem in problems)
+    assert Day6Part1.total_result([]) == 0
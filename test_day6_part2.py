@@ -1,4 +1,5 @@
 import pytest, tempfile, sys, os
+from day6_part1 import Day6Part1
 from day6_part2 import Day6Part2
 
 # Here's the example worksheet again:
@@ -47,3 +48,48 @@ def test_solve_problem3():
 def test_total_result():
     problems = Day6Part2.parse_input(input_text)
     assert Day6Part2.total_result(problems) == 3263827
+
+def test_problem_spans():
+    rows = Day6Part1.load_worksheet(input_text)
+    assert all(len(row) == 15 for row in rows)
+    assert Day6Part1.problem_spans(rows) == [(0, 3), (4, 7), (8, 11), (12, 15)]
+
+def test_both_parts_from_one_worksheet():
+    rows = Day6Part1.load_worksheet(input_text)
+    assert Day6Part1.total_result(Day6Part1.row_problems(rows)) == 4277556
+    assert Day6Part2.total_result(Day6Part2.column_problems(rows, Day6Part1.problem_spans(rows))) == 3263827
+
+def test_stream_problems():
+    with tempfile.NamedTemporaryFile(mode="w+", delete=False) as tmp:
+        tmp.write(input_text)
+        tmp.flush()
+        tmp_name = tmp.name
+    try:
+        # A block size of 2 makes every problem straddle a block boundary.
+        problems = list(Day6Part1.stream_problems(tmp_name, block_size=2))
+        assert problems[0] == [b'123', b' 45', b'  6', b'*  ']
+        assert len(problems) == 4
+        assert Day6Part1.total_result_streaming(tmp_name) == 4277556
+        assert Day6Part2.total_result_streaming(tmp_name) == 3263827
+    finally:
+        try:
+            os.unlink(tmp_name)
+        except Exception:
+            pass
+
+def test_stream_problems_skips_blank_lines():
+    with tempfile.NamedTemporaryFile(mode="w+b", delete=False) as tmp:
+        # A whitespace-only line in the middle and at the end, and \r\n endings.
+        tmp.write(input_text.replace('\n', '\r\n', 1).replace(' 45', '      \t   \n 45', 1).encode() + b'   \n')
+        tmp.flush()
+        tmp_name = tmp.name
+    try:
+        problems = list(Day6Part1.stream_problems(tmp_name, block_size=2))
+        assert problems[0] == [b'123', b' 45', b'  6', b'*  ']
+        assert Day6Part1.total_result_streaming(tmp_name) == 4277556
+        assert Day6Part2.total_result_streaming(tmp_name) == 3263827
+    finally:
+        try:
+            os.unlink(tmp_name)
+        except Exception:
+            pass
@@ -85,4 +85,8 @@ input_text = """.......S.......
 def test_total_result():
     lines = Day7Part1.parse_input(input_text)
     assert Day7Part1.iterate_tachyon_beam(lines) == 21
-    
\ No newline at end of file
+    
+def test_count_splits():
+    lines = Day7Part1.parse_input(input_text)
+    assert Day7Part1.count_splits(lines) == 21
+    assert list(Day7Part1.splitter_bitsets(['..^.^', '^'])) == [0b10100, 0b1]
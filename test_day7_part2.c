@@ -1,23 +1,44 @@
 // Unit tests for day7_part2.c
+// cc -o test_day7_part2 test_day7_part2.c && ./test_day7_part2
 #include <stdio.h>
 #include <string.h>
 #include <assert.h>
+#define DAY7_PART2_NO_MAIN
 #include "day7_part2.c"
 
+const char* sample =
+    ".......S.......\n"
+    "...............\n"
+    ".......^.......\n"
+    "...............\n"
+    "......^.^......\n"
+    "...............\n"
+    ".....^.^.^.....\n"
+    "...............\n"
+    "....^.^...^....\n"
+    "...............\n"
+    "...^.^...^.^...\n"
+    "...............\n"
+    "..^...^.....^..\n"
+    "...............\n"
+    ".^.^.^.^.^...^.\n"
+    "...............\n";
+
 void test_parse_input() {
-    const char* input = "S..^\n..^S\n";
-    char lines[2][MAX_LINE_LENGTH];
+    const char* input = "S..^\r\n\n..^S\n";
     int num_lines = 0;
-    parse_input(input, lines, &num_lines);
-    assert(num_lines == 2);
+    char** lines = parse_input(input, strlen(input), &num_lines);
+    assert(num_lines == 3);
     assert(strcmp(lines[0], "S..^") == 0);
-    assert(strcmp(lines[1], "..^S") == 0);
+    assert(strcmp(lines[1], "") == 0);
+    assert(strcmp(lines[2], "..^S") == 0);
+    free_lines(lines, num_lines);
     printf("test_parse_input passed\n");
 }
 
 void test_find_item_indices() {
     const char* line = "S..^..^S";
-    int items[MAX_LINE_LENGTH];
+    int items[8];
     int num_items = 0;
     find_item_indices(line, '^', items, &num_items);
     assert(num_items == 2);
@@ -26,10 +47,41 @@ void test_find_item_indices() {
     printf("test_find_item_indices passed\n");
 }
 
+void test_day7_sweep() {
+    unsigned long long split_count = 0, timeline_count = 0;
+    assert(day7_sweep(sample, strlen(sample), &split_count, &timeline_count) == DAY7_OK);
+    assert(split_count == 21);
+    assert(timeline_count == 40);
+    printf("test_day7_sweep passed\n");
+}
+
+void test_day7_sweep_overflow() {
+    // Every beam hits a splitter on every splitter row, so the timelines double
+    // each time and 64 doublings don't fit.
+    int splitter_rows = 64, width = 2 * 64 + 3, start = 64 + 1;
+    char* text = (char*)malloc((2 * splitter_rows + 1) * (width + 1) + 1);
+    char* p = text;
+    for (int column = 0; column < width; ++column) *p++ = column == start ? 'S' : '.';
+    *p++ = '\n';
+    for (int k = 0; k < splitter_rows; ++k) {
+        for (int column = 0; column < width; ++column) *p++ = '.';
+        *p++ = '\n';
+        for (int column = 0; column < width; ++column) *p++ = (column - start + k) % 2 == 0 ? '^' : '.';
+        *p++ = '\n';
+    }
+    unsigned long long split_count = 0, timeline_count = 0;
+    assert(day7_sweep(text, p - text, &split_count, &timeline_count) == DAY7_OVERFLOW);
+    assert(day7_sweep(text, p - text - 2 * (width + 1), &split_count, &timeline_count) == DAY7_OK);
+    assert(timeline_count == 1ULL << 63);
+    free(text);
+    printf("test_day7_sweep_overflow passed\n");
+}
+
 int main() {
     test_parse_input();
     test_find_item_indices();
-    // Add more tests as needed
+    test_day7_sweep();
+    test_day7_sweep_overflow();
     printf("All tests passed!\n");
     return 0;
 }
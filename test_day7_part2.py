@@ -1,4 +1,5 @@
-import pytest, tempfile, sys, os
+import pytest, tempfile, sys, os, random
+import day7_part2
 from day7_part2 import Day7Part2
 
 # Since this is impossible, the manual recommends the many-worlds interpretation of quantum tachyon splitting: each time a particle reaches a splitter, it's actually time itself which splits. In one timeline, the particle went left, and in the other timeline, the particle went right.
@@ -82,7 +83,76 @@ input_text = """.......S.......
 ...............
 """
 
+def doubling_manifold(splitter_rows):
+    # Every beam hits a splitter on every splitter row, so the timelines double
+    # each time: 2 ** splitter_rows timelines from
+    # splitter_rows * (splitter_rows + 1) // 2 splits.
+    width = 2 * splitter_rows + 3
+    start = splitter_rows + 1
+    lines = ['.' * start + 'S' + '.' * (width - start - 1)]
+    for k in range(splitter_rows):
+        lines.append('.' * width)
+        lines.append(''.join('^' if (column - start + k) % 2 == 0 else '.' for column in range(width)))
+    return lines
+
 def test_total_result():
     lines = Day7Part2.parse_input(input_text)
     assert Day7Part2.iterate_tachyon_beam(lines) == 40
-    
\ No newline at end of file
+    
+def test_sweep():
+    lines = Day7Part2.parse_input(input_text)
+    # Part 1's split count comes out of the same pass.
+    assert Day7Part2.sweep(lines) == (21, 40)
+
+def test_sweep_tall_manifold():
+    # More splitter rows than Python's recursion limit.
+    splitter_rows = 1200
+    lines = doubling_manifold(splitter_rows)
+    split_count, timeline_count = Day7Part2.sweep(lines)
+    assert timeline_count == 2 ** splitter_rows
+    assert split_count == splitter_rows * (splitter_rows + 1) // 2
+
+def test_sweep_vectorized():
+    pytest.importorskip("numpy")
+    lines = Day7Part2.parse_input(input_text)
+    assert Day7Part2.sweep_vectorized(lines) == (21, 40)
+
+def test_sweep_vectorized_big_totals():
+    pytest.importorskip("numpy")
+    # 100 doublings is past int64, so the counts have to switch to Python ints.
+    splitter_rows = 100
+    lines = doubling_manifold(splitter_rows)
+    assert Day7Part2.sweep_vectorized(lines) == Day7Part2.sweep(lines) == (5050, 2 ** 100)
+
+needs_native = pytest.mark.skipif(day7_part2.native is None, reason="day7_part2.c is not built as a shared library")
+
+@needs_native
+@pytest.mark.parametrize("name", ["dean", "gayle"])
+def test_sweep_native_matches_python_on_inputs(name):
+    input_filename = os.path.join(os.path.dirname(os.path.abspath(__file__)), f"day7_input_{name}.txt")
+    if not os.path.exists(input_filename):
+        pytest.skip(f"{input_filename} not found")
+    lines = Day7Part2.parse_input(open(input_filename).read())
+    assert Day7Part2.sweep_native(lines) == Day7Part2.sweep(lines)
+
+@needs_native
+def test_sweep_native_matches_python_on_random_grids():
+    rng = random.Random(7)
+    for trial in range(20):
+        width, height = rng.randint(1, 3000), rng.randint(1, 200)
+        density = rng.random() / 2
+        start = rng.randrange(width)
+        lines = ['.' * start + 'S' + '.' * (width - start - 1)]
+        for row in range(1, height):
+            lines.append(''.join('^' if rng.random() < density else '.' for column in range(rng.randint(0, width))))
+        assert Day7Part2.sweep_native(lines) == Day7Part2.sweep(lines)
+
+@needs_native
+def test_sweep_native_overflow_falls_back():
+    # 64 doublings doesn't fit in 64 bits; the native sweep gives up and
+    # iterate_tachyon_beam answers with Python ints instead.
+    splitter_rows = 64
+    lines = doubling_manifold(splitter_rows)
+    assert Day7Part2.sweep_native(lines) is None
+    assert Day7Part2.sweep_native(lines[:-2]) == Day7Part2.sweep(lines[:-2])
+    assert Day7Part2.iterate_tachyon_beam(lines) == 2 ** 64
@@ -0,0 +1,115 @@
+import pytest, tempfile, sys, os
+from textwrap import dedent
+import day8_binary
+from day8_binary import *
+from day8_part1 import parse_input, closest_pairs
+
+input_text = dedent('''\
+    162,817,812
+    57,618,57
+    906,360,560
+    592,479,940
+    352,342,300
+    466,668,158
+    542,29,236
+    431,825,988
+    739,650,466
+    52,470,668
+    216,146,977
+    819,987,18
+    117,168,530
+    805,96,715
+    346,949,466
+    970,615,88
+    941,993,340
+    862,61,35
+    984,92,344
+    425,690,689
+''')
+
+def temporary_file(contents, mode):
+    with tempfile.NamedTemporaryFile(mode=mode, delete=False) as tmp:
+        tmp.write(contents)
+        return tmp.name
+
+def test_convert_and_load():
+    text_name = temporary_file(input_text + '\n', "w")
+    binary_name = text_name + '.bin'
+    try:
+        convert(text_name, binary_name)
+        assert os.path.getsize(binary_name) == HEADER.size + 20 * 12
+        junctions = parse_input(input_text)
+        with PointCloud(binary_name) as cloud:
+            assert len(cloud) == 20
+            assert cloud[0] == (162, 817, 812)
+            assert cloud[-1] == (425, 690, 689)
+            assert cloud[2:5] == junctions[2:5]
+            assert list(cloud) == junctions
+            assert (57, 618, 57) in cloud
+            assert closest_pairs(cloud, 10) == closest_pairs(junctions, 10)
+            with pytest.raises(IndexError):
+                cloud[20]
+        cloud = load_junctions(binary_name)
+        assert isinstance(cloud, PointCloud)
+        cloud.close()
+        assert load_junctions(text_name) == junctions
+    finally:
+        os.unlink(text_name)
+        if os.path.exists(binary_name):
+            os.unlink(binary_name)
+
+def test_columns_without_numpy(monkeypatch):
+    monkeypatch.setattr(day8_binary, "np", None)
+    binary_name = temporary_file(b'', "wb")
+    try:
+        write_point_cloud([(1, -2, 3), (-4, 5, 2**31 - 1)], binary_name)
+        with PointCloud(binary_name) as cloud:
+            assert list(cloud.z) == [3, 2**31 - 1]
+            assert list(cloud) == [(1, -2, 3), (-4, 5, 2**31 - 1)]
+    finally:
+        os.unlink(binary_name)
+
+def test_numpy_columns():
+    np = pytest.importorskip("numpy")
+    binary_name = temporary_file(b'', "wb")
+    try:
+        write_point_cloud(parse_input(input_text), binary_name)
+        with PointCloud(binary_name) as cloud:
+            assert np.asarray(cloud).shape == (20, 3)
+            assert np.asarray(cloud)[19].tolist() == [425, 690, 689]
+            assert int(cloud.x.sum()) == sum(x for x, y, z in parse_input(input_text))
+    finally:
+        os.unlink(binary_name)
+
+def test_empty_cloud():
+    binary_name = temporary_file(b'', "wb")
+    try:
+        write_point_cloud([], binary_name)
+        with PointCloud(binary_name) as cloud:
+            assert len(cloud) == 0
+            assert list(cloud) == []
+    finally:
+        os.unlink(binary_name)
+
+def test_bad_files():
+    not_binary = temporary_file(input_text.encode(), "wb")
+    truncated = temporary_file(HEADER.pack(MAGIC, VERSION, 0, 5) + bytes(12 * 4), "wb")
+    newer = temporary_file(HEADER.pack(MAGIC, VERSION + 1, 0, 0), "wb")
+    try:
+        with pytest.raises(ValueError, match="not a junction file"):
+            PointCloud(not_binary)
+        with pytest.raises(ValueError, match="truncated"):
+            PointCloud(truncated)
+        with pytest.raises(ValueError, match="version"):
+            PointCloud(newer)
+    finally:
+        for name in (not_binary, truncated, newer):
+            os.unlink(name)
+
+def test_write_rejects_coordinates_past_int32():
+    binary_name = temporary_file(b'', "wb")
+    try:
+        with pytest.raises(OverflowError):
+            write_point_cloud([(0, 0, 2**31)], binary_name)
+    finally:
+        os.unlink(binary_name)
@@ -0,0 +1,75 @@
+import pytest, tempfile, sys, os, random
+from textwrap import dedent
+from day8_emst import *
+from day8_part1 import UnionFind
+
+input_text = dedent('''\
+    162,817,812
+    57,618,57
+    906,360,560
+    592,479,940
+    352,342,300
+    466,668,158
+    542,29,236
+    431,825,988
+    739,650,466
+    52,470,668
+    216,146,977
+    819,987,18
+    117,168,530
+    805,96,715
+    346,949,466
+    970,615,88
+    941,993,340
+    862,61,35
+    984,92,344
+    425,690,689
+''')
+
+def kruskal(points):
+    # Every pair, sorted, and the tree edges Kruskal picks from them.
+    pairs = sorted((sum((a - b)**2 for a, b in zip(points[i], points[j])), i, j)
+                   for i in range(len(points)) for j in range(i + 1, len(points)))
+    circuits = UnionFind(len(points))
+    return pairs, [pair for pair in pairs if circuits.union(pair[1], pair[2])]
+
+def test_sample():
+    junctions = parse_input(input_text)
+    mst = EuclideanMST(junctions)
+    assert len(mst.edges) == len(junctions) - 1
+    # After making the ten shortest connections there are 11 circuits.
+    assert mst.circuit_sizes(10) == [5,4,2,2,1,1,1,1,1,1,1]
+    # The last connection is between 216,146,977 and 117,168,530.
+    assert mst.bottleneck_edge()[1:] == (10, 12)
+    assert mst.last_connection_product() == 25272
+
+def test_component_sizes():
+    junctions = parse_input(input_text)
+    mst = EuclideanMST(junctions)
+    assert mst.component_sizes(0) == [1] * 20
+    assert mst.component_sizes(1) == [2] + [1] * 18
+    assert mst.component_sizes(len(mst.edges)) == [20]
+
+def test_matches_kruskal_on_random_clouds():
+    rng = random.Random(23)
+    for trial in range(40):
+        size = rng.choice([1, 3, 1000]) # small sizes make lots of ties
+        points = [(rng.randint(0, size), rng.randint(0, size), rng.randint(0, size)) for _ in range(rng.randint(0, 100))]
+        pairs, tree = kruskal(points)
+        mst = EuclideanMST(points)
+        assert mst.edges == tree
+        connections = rng.randint(0, len(pairs))
+        circuits = UnionFind(len(points))
+        for d2, i, j in pairs[:connections]:
+            circuits.union(i, j)
+        assert mst.circuit_sizes(connections) == sorted(circuits.component_sizes(), reverse=True)
+
+def test_kd_tree():
+    rng = random.Random(5)
+    points = [(rng.randint(0, 50), rng.randint(0, 50), rng.randint(0, 50)) for _ in range(200)]
+    order, nodes = build_kd_tree(points)
+    assert sorted(order) == list(range(200))
+    for start, end, low, high, left, right in nodes:
+        assert end - start <= LEAF_SIZE or left >= 0
+        for i in order[start:end]:
+            assert all(low[axis] <= points[i][axis] <= high[axis] for axis in range(3))
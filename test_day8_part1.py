@@ -1,4 +1,4 @@
-import pytest, tempfile, sys, os
+import pytest, tempfile, sys, os, random, math
 from textwrap import dedent
 from day8_part1 import *
 
@@ -100,4 +100,83 @@ def test_connect_circuits():
 
     # After making the ten shortest connections, there are 11 circuits: one circuit which contains 5 junction boxes, one circuit which contains 4 junction boxes, two circuits which contain 2 junction boxes each, and seven circuits which each contain a single junction box. Multiplying together the sizes of the three largest circuits (5, 4, and one of the circuits of size 2) produces 40.   
     assert circuit_sizes == [5,4,2,2,1,1,1,1,1,1,1]    
-        
\ No newline at end of file
+        
+def all_pairs(points):
+    return sorted((sum((a - b)**2 for a, b in zip(points[i], points[j])), i, j)
+                  for i in range(len(points)) for j in range(i + 1, len(points)))
+
+def test_closest_pair_indices():
+    junctions = parse_input(input_text)
+    closest = closest_pair_indices(junctions, 10)
+    assert closest == all_pairs(junctions)[:10]
+    # 162,817,812 and 425,690,689: 263**2 + 127**2 + 123**2
+    assert closest[0] == (100427, 0, 19)
+
+def test_closest_pair_indices_random_clouds():
+    rng = random.Random(8)
+    for trial in range(50):
+        size = rng.choice([1, 10, 1000])
+        points = [(rng.randint(0, size), rng.randint(0, size), rng.randint(0, size)) for _ in range(rng.randint(0, 80))]
+        limit = rng.randint(1, 400)
+        expected = all_pairs(points)[:limit]
+        assert closest_pair_indices(points, limit) == expected
+        # Cells far too small for the cloud: it has to grow them and start over.
+        assert closest_pair_indices(points, limit, cell_size=1) == expected
+
+def test_closest_pair_indices_vectorized():
+    pytest.importorskip("numpy")
+    junctions = parse_input(input_text)
+    assert closest_pair_indices_vectorized(junctions, 10) == all_pairs(junctions)[:10]
+    rng = random.Random(20)
+    for trial in range(50):
+        size = rng.choice([1, 10, 1000])
+        points = [(rng.randint(0, size), rng.randint(0, size), rng.randint(0, size)) for _ in range(rng.randint(0, 80))]
+        limit = rng.randint(1, 400)
+        # Small tiles so the pairs are spread over many blocks, ties and all.
+        assert closest_pair_indices_vectorized(points, limit, tile=7) == all_pairs(points)[:limit]
+        assert closest_pairs(points, limit) == all_pairs(points)[:limit]
+
+def test_union_find():
+    circuits = UnionFind(6)
+    assert circuits.union(0, 1)
+    assert circuits.union(2, 3)
+    assert circuits.union(1, 3)
+    assert not circuits.union(0, 2)
+    assert circuits.count == 3
+    assert circuits.find(0) == circuits.find(3)
+    assert circuits.component_size(2) == 4
+    assert sorted(circuits.component_sizes()) == [1, 1, 4]
+
+def test_union_find_long_chain():
+    # Far deeper than the recursion limit if find recursed.
+    size = 100000
+    circuits = UnionFind(size)
+    for i in range(size - 1):
+        circuits.parent[i] = i + 1 # worst case: a single path, bypassing union by size
+    assert circuits.find(0) == size - 1
+    assert circuits.find(0) == size - 1
+
+def test_circuit_size_products():
+    junctions = parse_input(input_text)
+    pairs = closest_pairs(junctions, 190) # all of them
+    products = circuit_size_products(len(junctions), pairs)
+    assert len(products) == 191
+    assert products[0] == 1
+    assert products[1] == 2 # 2, 1, 1
+    assert products[10] == 40 # 5, 4, 2
+    assert products[-1] == 20 # everything in one circuit
+    for connections in range(0, 191, 7):
+        circuit_lengths = connect_circuits(closest_junctions(junctions, connections), junctions)
+        assert products[connections] == math.prod(circuit_lengths[:3])
+
+def test_calculate_result():
+    junctions = parse_input(input_text)
+    assert calculate_result(junctions, 10) == 40
+
+def test_parse_input_errors():
+    # Blank lines are skipped, anything else that doesn't parse is an error naming the line.
+    assert parse_input("1,2,3\n\n  \n4,5,6\n") == [(1, 2, 3), (4, 5, 6)]
+    with pytest.raises(ValueError, match="'1,2'"):
+        parse_input("1,2,3\n1,2\n")
+    with pytest.raises(ValueError, match="x,2,3"):
+        parse_input("x,2,3")
@@ -1,4 +1,4 @@
-import pytest, tempfile, sys, os
+import pytest, tempfile, sys, os, random
 from textwrap import dedent
 from day8_part2 import *
 
@@ -53,3 +53,31 @@ def test_find_last_connection():
     junctions = parse_input(input_text)
     result = find_last_connection(junctions)
     assert result == 25272
+
+def test_find_last_connection_two_clusters():
+    # Two far-apart clusters: the pair that joins them is longer than every pair
+    # inside either cluster, so the first batch of shortest pairs can't finish.
+    rng = random.Random(22)
+    junctions = sorted({(rng.randint(0, 100), rng.randint(0, 100), rng.randint(0, 100)) for _ in range(150)})
+    junctions += [(x + 10**6, y, z) for x, y, z in junctions]
+    pairs = sorted((calculate_distance(j1, j2), i, j) for i, j1 in enumerate(junctions) for j, j2 in enumerate(junctions) if i < j)
+    uf = UnionFind(len(junctions))
+    for d, i, j in pairs:
+        if uf.union(i, j) and uf.count == 1:
+            break
+    assert find_last_connection(junctions) == junctions[i][0] * junctions[j][0]
+
+def test_lazy_pairs():
+    junctions = parse_input(input_text)
+    all_pairs = sorted((sum((a - b)**2 for a, b in zip(junctions[i], junctions[j])), i, j)
+                       for i in range(len(junctions)) for j in range(i + 1, len(junctions)))
+    assert list(lazy_pairs(junctions)) == all_pairs
+    # Tiny cells: most streams end up walking the occupied cells ring by ring.
+    assert list(lazy_pairs(junctions, cell_size=1)) == all_pairs
+    assert last_connection(len(junctions), lazy_pairs(junctions)) == (10, 12) # 216,146,977 and 117,168,530
+
+def test_find_last_connection_streaming(monkeypatch):
+    import day8_part2
+    monkeypatch.setattr(day8_part2, "STREAM_POINTS", 0)
+    junctions = parse_input(input_text)
+    assert find_last_connection(junctions) == 25272